@@ -0,0 +1,111 @@
+from Stmt import Stmt
+from hashlib import sha256
+from importlib import import_module
+from os import listdir, makedirs, path, remove, replace, stat, utime
+from tempfile import NamedTemporaryFile
+from typing import List
+import pickle
+import sys
+
+MAGIC: bytes = b'WIZAST'
+
+# Modules whose changes can alter the tree produced for the same source
+FRONT_END: List[str] = ['Token', 'Expr', 'Stmt', 'Scanner', 'RegexScanner', 'Parser', 'Resolver', 'Optimizer', 'TypeInference', 'language.Keywords', 'language.KeywordTrie', 'language.Language']
+
+class AstCache:
+    # Parsed and resolved programs stored by hash of the source, language and interpreter version,
+    # so running an unchanged file skips scanning, parsing and resolving
+    def __init__(self, directory: str, version: str, maxSize: int) -> None:
+        self.directory: str = directory
+        self.maxSize: int = maxSize
+
+        # The front end's own code is part of the key, so editing it invalidates old entries even without a version bump
+        frontEnd = sha256()
+
+        for module in FRONT_END:
+            with open(import_module(module).__file__, 'rb') as file:
+                frontEnd.update(file.read())
+
+        self.prefix: bytes = f'{version}\0{sys.version_info[:2]}\0{frontEnd.hexdigest()}\0'.encode()
+
+    def load(self, source: str, language: str) -> List[Stmt]:
+        key: bytes = self.key(source, language)
+        file: str = self.path(key)
+
+        try:
+            with open(file, 'rb') as entry:
+                if entry.read(len(MAGIC) + len(key)) != MAGIC + key:
+                    raise ValueError('Cache entry does not match its source')
+
+                statements: List[Stmt] = pickle.load(entry)
+
+            # The modification time records the last use for eviction
+            utime(file)
+            return statements
+
+        except FileNotFoundError:
+            return None
+
+        except Exception:
+            self.discard(file)
+            return None
+
+    def store(self, source: str, language: str, statements: List[Stmt]) -> None:
+        key: bytes = self.key(source, language)
+        temporary: str = None
+
+        try:
+            makedirs(self.directory, exist_ok=True)
+
+            # Written to a temporary file first, so concurrent runs never see a partial entry
+            with NamedTemporaryFile('wb', dir=self.directory, suffix='.tmp', delete=False) as entry:
+                temporary = entry.name
+                entry.write(MAGIC + key)
+                pickle.dump(statements, entry, pickle.HIGHEST_PROTOCOL)
+
+            replace(temporary, self.path(key))
+
+        except (OSError, RecursionError, pickle.PicklingError):
+            if temporary is not None:
+                self.discard(temporary)
+
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        # Least recently used entries go first until the cache fits its size
+        entries: List[tuple[float, int, str]] = []
+
+        for name in listdir(self.directory):
+            if not name.endswith('.wizc'):
+                continue
+
+            try:
+                status = stat(path.join(self.directory, name))
+                entries.append((status.st_mtime, status.st_size, name))
+
+            except OSError:
+                pass
+
+        size: int = sum(entry[1] for entry in entries)
+
+        for _, entrySize, name in sorted(entries):
+            if size <= self.maxSize:
+                break
+
+            self.discard(path.join(self.directory, name))
+            size -= entrySize
+
+    def key(self, source: str, language: str) -> bytes:
+        return sha256(self.prefix + language.encode() + b'\0' + source.encode()).digest()
+
+    def path(self, key: bytes) -> str:
+        return path.join(self.directory, key.hex() + '.wizc')
+
+    def discard(self, file: str) -> None:
+        try:
+            remove(file)
+
+        except OSError:
+            pass
@@ -0,0 +1,129 @@
+from Expr import Expr, Variable, Assign, Binary, Call, Grouping, Literal, Unary, This, Set, Get, Super
+from Stmt import Stmt, Block, Var, Function, Expression, If, Return, While, For, Class
+from typing import List, override
+
+# Prints a tree as nested parenthesized forms, one statement per line, with the slots the resolver assigned
+
+class AstPrinter(Expr.Visitor, Stmt.Visitor):
+    def __init__(self) -> None:
+        self.depth: int = 0
+
+    def print(self, statements: List[Stmt]) -> str:
+        return '\n'.join(self.statement(statement) for statement in statements)
+
+    # Statements
+
+    @override
+    def visitBlockStmt(self, stmt: Block) -> str:
+        return self.nested(f'(block size={stmt.size}', stmt.statements)
+
+    @override
+    def visitVarStmt(self, stmt: Var) -> str:
+        initializer: str = '' if stmt.initializer is None else f' {self.expression(stmt.initializer)}'
+        return f'(var {stmt.name.lexeme}{self.slot(stmt.slot)}{initializer})'
+
+    @override
+    def visitFunctionStmt(self, stmt: Function) -> str:
+        params: str = ' '.join(param.lexeme for param in stmt.params)
+        return self.nested(f'(function {stmt.name.lexeme}{self.slot(stmt.slot)} ({params}) size={stmt.size}', stmt.body)
+
+    @override
+    def visitClassStmt(self, stmt: Class) -> str:
+        superclass: str = '' if stmt.superclass is None else f' < {stmt.superclass.name.lexeme}'
+        return self.nested(f'(class {stmt.name.lexeme}{self.slot(stmt.slot)}{superclass}', stmt.methods)
+
+    @override
+    def visitExpressionStmt(self, stmt: Expression) -> str:
+        return f'(expression {self.expression(stmt.expression)})'
+
+    @override
+    def visitIfStmt(self, stmt: If) -> str:
+        branches: List[Stmt] = [stmt.thenBranch] if stmt.elseBranch is None else [stmt.thenBranch, stmt.elseBranch]
+        return self.nested(f'(if {self.expression(stmt.condition)}', branches)
+
+    @override
+    def visitWhileStmt(self, stmt: While) -> str:
+        return self.nested(f'(while {self.expression(stmt.condition)}', [stmt.body])
+
+    @override
+    def visitForStmt(self, stmt: For) -> str:
+        return self.nested(f'(for {stmt.name.lexeme} {self.expression(stmt.start)} {self.expression(stmt.end)}', [stmt.body])
+
+    @override
+    def visitReturnStmt(self, stmt: Return) -> str:
+        return '(return)' if stmt.value is None else f'(return {self.expression(stmt.value)})'
+
+    # Expressions
+
+    @override
+    def visitLiteralExpr(self, expr: Literal) -> str:
+        return repr(expr.value)
+
+    @override
+    def visitGroupingExpr(self, expr: Grouping) -> str:
+        return f'(group {self.expression(expr.expression)})'
+
+    @override
+    def visitUnaryExpr(self, expr: Unary) -> str:
+        return f'({expr.operator.lexeme} {self.expression(expr.right)})'
+
+    @override
+    def visitBinaryExpr(self, expr: Binary) -> str:
+        if expr.operands is None:
+            return f'({expr.operator.lexeme} {self.expression(expr.left)} {self.expression(expr.right)})'
+
+        # Specialized arithmetic shows its operand type, operands still checked at runtime end with ?
+        left: str = self.expression(expr.left) + ('?' if expr.guardLeft else '')
+        right: str = self.expression(expr.right) + ('?' if expr.guardRight else '')
+
+        return f'({expr.operator.lexeme}:{expr.operands.__name__} {left} {right})'
+
+    @override
+    def visitVariableExpr(self, expr: Variable) -> str:
+        return f'{expr.name.lexeme}{self.local(expr.depth, expr.slot)}'
+
+    @override
+    def visitAssignExpr(self, expr: Assign) -> str:
+        return f'(= {expr.name.lexeme}{self.local(expr.depth, expr.slot)} {self.expression(expr.value)})'
+
+    @override
+    def visitCallExpr(self, expr: Call) -> str:
+        arguments: str = ''.join(f' {self.expression(argument)}' for argument in expr.arguments)
+        return f'({"tail-call" if expr.tail else "call"} {self.expression(expr.callee)}{arguments})'
+
+    @override
+    def visitGetExpr(self, expr: Get) -> str:
+        return f'(. {self.expression(expr.object)} {expr.name.lexeme})'
+
+    @override
+    def visitSetExpr(self, expr: Set) -> str:
+        return f'(.= {self.expression(expr.object)} {expr.name.lexeme} {self.expression(expr.value)})'
+
+    @override
+    def visitThisExpr(self, expr: This) -> str:
+        return f'{expr.keyword.lexeme}{self.local(expr.depth, expr.slot)}'
+
+    @override
+    def visitSuperExpr(self, expr: Super) -> str:
+        return f'({expr.keyword.lexeme}{self.local(expr.depth, expr.slot)} {expr.method.lexeme})'
+
+    # Helpers
+
+    def statement(self, stmt: Stmt) -> str:
+        return '  ' * self.depth + stmt.accept(self)
+
+    def expression(self, expr: Expr) -> str:
+        return expr.accept(self)
+
+    def nested(self, head: str, statements: List[Stmt]) -> str:
+        self.depth += 1
+        lines: List[str] = [head] + [self.statement(statement) for statement in statements]
+        self.depth -= 1
+
+        return '\n'.join(lines) + ')'
+
+    def slot(self, slot: int) -> str:
+        return '' if slot is None else f'@{slot}'
+
+    def local(self, depth: int, slot: int) -> str:
+        return '' if depth is None else f'@{depth}:{slot}'
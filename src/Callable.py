@@ -1,16 +1,38 @@
 from abc import ABC, abstractmethod
+from sys import maxsize
 from typing import Any, List
 # from Interpreter import Interpreter
 
+# Default limit on nested Wiz calls, past it the backends report a runtime error
+MAX_CALL_DEPTH: int = 10000
+
+# Upper arity of a callable taking any number of arguments
+VARIADIC: int = maxsize
+
 class Callable(ABC):
-    @abstractmethod
-    def call(self, interpreter: 'Interpreter', arguments: List[Any]) -> Any:
-        pass
+    __slots__ = ()
+
+    # Range of argument counts a call may pass, declared once per callable so call sites only compare them
+    minArity: int = 0
+    maxArity: int = 0
 
     @abstractmethod
-    def arity(self) -> int:
+    def call(self, interpreter: 'Interpreter', arguments: List[Any]) -> Any:
         pass
 
     @abstractmethod
     def __str__(self) -> str:
         pass
+
+    def arityMessage(self, count: int) -> str:
+        if self.minArity == self.maxArity:
+            return f'Expected {self.minArity} argument(s) but got {count}'
+
+        if self.maxArity == VARIADIC:
+            return f'Expected at least {self.minArity} argument(s) but got {count}'
+
+        # A single optional argument reads as a choice between two counts
+        if self.maxArity == self.minArity + 1:
+            return f'Expected {self.minArity} or {self.maxArity} argument(s) but got {count}'
+
+        return f'Expected {self.minArity} to {self.maxArity} argument(s) but got {count}'
@@ -0,0 +1,32 @@
+from OpCode import OpCode
+from typing import Any, List, Tuple
+
+class Chunk:
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.code: List[Tuple[int, int, int]] = []
+        self.constants: List[Any] = []
+        self.constantIndexes: dict[Tuple[type, Any], int] = {}
+
+    def write(self, op: OpCode, a: int = 0, b: int = 0) -> int:
+        self.code.append((op.value, a, b))
+        return len(self.code) - 1
+
+    def patch(self, index: int, a: int) -> None:
+        op, _, b = self.code[index]
+        self.code[index] = (op, a, b)
+
+    def addConstant(self, value: Any) -> int:
+        # Numbers and names are shared in the pool, everything else (tokens, nodes) gets its own entry
+        if isinstance(value, (str, float)):
+            key = (type(value), value)
+
+            if key not in self.constantIndexes:
+                self.constants.append(value)
+                self.constantIndexes[key] = len(self.constants) - 1
+
+            return self.constantIndexes[key]
+
+        self.constants.append(value)
+        return len(self.constants) - 1
+
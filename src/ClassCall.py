@@ -1,6 +1,7 @@
 from Callable import Callable
 from Instance import Instance
 from FunctionCall import FunctionCall
+from Shape import Shape
 from typing import Any, List, override
 
 class ClassCall(Callable):
@@ -9,32 +10,34 @@ class ClassCall(Callable):
         self.superclass: ClassCall = superclass
         self.methods = methods
 
+        # Inherited methods are copied in once, so a lookup never walks the superclass chain
+        self.methodTable: dict[str, FunctionCall] = {}
+
+        if superclass is not None:
+            self.methodTable.update(superclass.methodTable)
+
+        self.methodTable.update(methods)
+        self.initializer: FunctionCall = next((method for method in self.methodTable.values() if method.isInitializer), None)
+
+        if self.initializer is not None:
+            self.minArity: int = self.initializer.minArity
+            self.maxArity: int = self.initializer.maxArity
+
+        # Shape of new instances, before any field is set
+        self.shape: Shape = Shape()
+
     def findMethod(self, name: str) -> FunctionCall:
-        if name in self.methods:
-            return self.methods[name]
-        
-        if self.superclass is not None:
-            return self.superclass.findMethod(name)
+        return self.methodTable.get(name)
 
     @override
     def call(self, interpreter, arguments: List[Any]) -> Any:
         instance: Instance = Instance(self)        
-        initializer: FunctionCall = self.findMethod('init')
 
-        if initializer is not None:
-            initializer.bind(instance).call(interpreter, arguments)
+        if self.initializer is not None:
+            self.initializer.bind(instance).call(interpreter, arguments)
         
         return instance
 
-    @override
-    def arity(self) -> int:
-        initializer: FunctionCall = self.findMethod('init')
-        
-        if initializer is None:
-            return 0
-
-        return initializer.arity()
-
     @override
     def __str__(self) -> str:
         return f'<class "{self.name}">'
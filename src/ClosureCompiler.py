@@ -0,0 +1,786 @@
+from Expr import Expr, Literal, Unary, Grouping, Binary, Variable, Assign, Call, Get, Set, This, Super
+from Stmt import Stmt, Expression, Var, Block, If, While, For, Function, Return, Class
+
+from Environment import Environment
+from Callable import MAX_CALL_DEPTH
+from FunctionCall import FunctionCall
+from Return import Return_, RETURNED, TAIL_CALL
+from ClassCall import ClassCall
+from Instance import Instance
+from TypeInference import OPERATIONS
+
+from TokenType import TokenType
+from Token import Token
+
+from ErrorHandler import ErrorHandler
+from RuntimeError import RuntimeError
+
+from lib.StdLib import defineStdLib
+from language.Language import Language
+
+from sys import getrecursionlimit, setrecursionlimit
+from typing import Any, Callable as Closure, List, override
+
+# Every node is compiled once into a Python closure taking the current environment,
+# so running the program does no visitor dispatch, locals lookups or operator matching
+
+# Python frames a Wiz call may take, so the call depth limit trips before Python's recursion limit
+FRAMES_PER_CALL: int = 25
+
+class ClosureCompiler(Expr.Visitor, Stmt.Visitor):
+    def __init__(self, errorHandler: ErrorHandler, language: Language, maxCallDepth: int = MAX_CALL_DEPTH) -> None:
+        self.globals: Environment = Environment()
+
+        self.errorHandler = errorHandler
+        self.language = language
+
+        self.maxCallDepth: int = maxCallDepth
+        self.callDepth: int = 0
+        setrecursionlimit(max(getrecursionlimit(), maxCallDepth * FRAMES_PER_CALL))
+
+        # Value of the last Wiz return, read by the call that receives RETURNED from its body
+        self.returnValue: Any = None
+        # Function and arguments of the last call in tail position, when the return value is TAIL_CALL
+        self.tailCall: tuple[FunctionCall, List[Any]] = None
+
+        defineStdLib(self.globals, self.language)
+
+    def interpret(self, statements: List[Stmt], isREPL: bool) -> None:
+        program: List[tuple[Closure, Closure]] = []
+        self.callDepth = 0
+
+        for statement in statements:
+            echo: Closure = None
+
+            if isREPL and isinstance(statement, Expression):
+                echo = self.compileExpression(statement.expression)
+
+            program.append((self.compileStatement(statement), echo))
+
+        try:
+            for execute, echo in program:
+                if execute(self.globals) is RETURNED:
+                    raise Return_(self.returnValue)
+
+                if echo is not None:
+                    print(echo(self.globals))
+
+        except RuntimeError as error:
+            self.errorHandler.runtimeError(error)
+
+    # Statements
+
+    @override
+    def visitExpressionStmt(self, stmt: Expression) -> Closure:
+        return self.compileExpression(stmt.expression)
+
+    @override
+    def visitIfStmt(self, stmt: If) -> Closure:
+        condition: Closure = self.compileExpression(stmt.condition)
+        thenBranch: Closure = self.compileStatement(stmt.thenBranch)
+
+        if stmt.elseBranch is None:
+            def if_(environment: Environment) -> object:
+                value = condition(environment)
+
+                if value is not None and value is not False:
+                    return thenBranch(environment)
+
+            return if_
+
+        elseBranch: Closure = self.compileStatement(stmt.elseBranch)
+
+        def ifElse(environment: Environment) -> object:
+            value = condition(environment)
+
+            if value is not None and value is not False:
+                return thenBranch(environment)
+
+            return elseBranch(environment)
+
+        return ifElse
+
+    @override
+    def visitWhileStmt(self, stmt: While) -> Closure:
+        condition: Closure = self.compileExpression(stmt.condition)
+        body: Closure = self.compileStatement(stmt.body)
+
+        def while_(environment: Environment) -> object:
+            while True:
+                value = condition(environment)
+
+                if value is None or value is False:
+                    return None
+
+                if body(environment) is RETURNED:
+                    return RETURNED
+
+        return while_
+
+    @override
+    def visitForStmt(self, stmt: For) -> Closure:
+        start: Closure = self.compileExpression(stmt.start)
+        end: Closure = self.compileExpression(stmt.end)
+        body: Closure = self.compileBody(stmt.body.statements)
+        size: int = stmt.body.size
+        keyword: Token = stmt.keyword
+        name: Token = stmt.name
+
+        def loop(environment: Environment) -> tuple[Environment, float]:
+            first = start(environment)
+            last = end(environment)
+
+            if type(first) is not float or type(last) is not float:
+                raise RuntimeError(keyword, 'Loop bounds must be numbers')
+
+            scope: Environment = Environment(environment, 1)
+            scope.slots[0] = first
+
+            return scope, last
+
+        def notNumber() -> None:
+            raise RuntimeError(name, 'Loop variable must be a number')
+
+        if stmt.perIteration:
+            # Functions declared in the body keep the scope they closed over, the next iteration gets a new one
+            def forPerIteration(environment: Environment) -> object:
+                scope, last = loop(environment)
+
+                while scope.slots[0] <= last:
+                    if body(Environment(scope, size) if size else scope) is RETURNED:
+                        return RETURNED
+
+                    counter: Any = scope.slots[0]
+
+                    if type(counter) is not float:
+                        notNumber()
+
+                    scope = Environment(environment, 1)
+                    scope.slots[0] = counter + 1
+
+                return None
+
+            return forPerIteration
+
+        if size == 0:
+            # The body declares nothing, so it runs straight in the loop's scope
+            def for_(environment: Environment) -> object:
+                scope, last = loop(environment)
+                slots: List[Any] = scope.slots
+
+                while slots[0] <= last:
+                    if body(scope) is RETURNED:
+                        return RETURNED
+
+                    if type(slots[0]) is float:
+                        slots[0] += 1
+
+                    else:
+                        notNumber()
+
+                return None
+
+            return for_
+
+        def forScoped(environment: Environment) -> object:
+            scope, last = loop(environment)
+            slots: List[Any] = scope.slots
+
+            while slots[0] <= last:
+                if body(Environment(scope, size)) is RETURNED:
+                    return RETURNED
+
+                if type(slots[0]) is float:
+                    slots[0] += 1
+
+                else:
+                    notNumber()
+
+            return None
+
+        return forScoped
+
+    @override
+    def visitVarStmt(self, stmt: Var) -> Closure:
+        name: str = stmt.name.lexeme
+        slot: int = stmt.slot
+        initializer: Closure = None
+
+        if stmt.initializer is not None:
+            initializer = self.compileExpression(stmt.initializer)
+
+        if slot is None:
+            if initializer is None:
+                def declareGlobal(environment: Environment) -> None:
+                    environment.values[name] = None
+
+                return declareGlobal
+
+            def defineGlobal(environment: Environment) -> None:
+                environment.values[name] = initializer(environment)
+
+            return defineGlobal
+
+        if initializer is None:
+            def declareLocal(environment: Environment) -> None:
+                environment.slots[slot] = None
+
+            return declareLocal
+
+        def defineLocal(environment: Environment) -> None:
+            environment.slots[slot] = initializer(environment)
+
+        return defineLocal
+
+    @override
+    def visitFunctionStmt(self, stmt: Function) -> Closure:
+        name: str = stmt.name.lexeme
+        slot: int = stmt.slot
+        body: Closure = self.compileBody(stmt.body)
+        language: Language = self.language
+
+        if slot is None:
+            def globalFunction(environment: Environment) -> None:
+                environment.values[name] = FunctionCall(stmt, environment, False, language, body)
+
+            return globalFunction
+
+        def localFunction(environment: Environment) -> None:
+            environment.slots[slot] = FunctionCall(stmt, environment, False, language, body)
+
+        return localFunction
+
+    @override
+    def visitReturnStmt(self, stmt: Return) -> Closure:
+        if stmt.value is None:
+            def returnNone(environment: Environment) -> object:
+                self.returnValue = None
+                return RETURNED
+
+            return returnNone
+
+        value: Closure = self.compileExpression(stmt.value)
+
+        def return_(environment: Environment) -> object:
+            self.returnValue = value(environment)
+            return RETURNED
+
+        return return_
+
+    @override
+    def visitClassStmt(self, stmt: Class) -> Closure:
+        superclassValue: Closure = None
+
+        if stmt.superclass is not None:
+            superclassValue = self.compileExpression(stmt.superclass)
+
+        methodBodies: List[tuple[Function, Closure]] = [(method, self.compileBody(method.body)) for method in stmt.methods]
+
+        def class_(environment: Environment) -> None:
+            superclass: Any = None
+
+            if superclassValue is not None:
+                superclass = superclassValue(environment)
+
+                if not isinstance(superclass, ClassCall):
+                    raise RuntimeError(stmt.superclass.name, 'Superclass must be a class')
+
+            self.declare(environment, stmt.name, stmt.slot, None)
+
+            closure: Environment = environment
+
+            if superclassValue is not None:
+                closure = Environment(environment, 1)
+                closure.slots[0] = superclass
+
+            methods: dict[str, FunctionCall] = {}
+
+            for method, body in methodBodies:
+                methods[method.name.lexeme] = FunctionCall(method, closure, method.name.lexeme == self.language.initName, self.language, body)
+
+            self.declare(environment, stmt.name, stmt.slot, ClassCall(stmt.name.lexeme, superclass, methods))
+
+        return class_
+
+    @override
+    def visitBlockStmt(self, stmt: Block) -> Closure:
+        body: Closure = self.compileBody(stmt.statements)
+        size: int = stmt.size
+
+        if size == 0:
+            return body
+
+        def block(environment: Environment) -> object:
+            return body(Environment(environment, size))
+
+        return block
+
+    # Expressions
+
+    @override
+    def visitLiteralExpr(self, expr: Literal) -> Closure:
+        value: Any = expr.value
+
+        def literal(environment: Environment) -> Any:
+            return value
+
+        return literal
+
+    @override
+    def visitUnaryExpr(self, expr: Unary) -> Closure:
+        right: Closure = self.compileExpression(expr.right)
+        operator: Token = expr.operator
+
+        match operator.type:
+            case TokenType.NOT:
+                def not_(environment: Environment) -> bool:
+                    value = right(environment)
+                    return value is None or value is False
+
+                return not_
+
+            case TokenType.MINUS:
+                def negate(environment: Environment) -> float:
+                    value = right(environment)
+
+                    if type(value) is float:
+                        return -value
+
+                    raise RuntimeError(operator, 'Operand must be a number')
+
+                return negate
+
+    @override
+    def visitGroupingExpr(self, expr: Grouping) -> Closure:
+        return self.compileExpression(expr.expression)
+
+    @override
+    def visitBinaryExpr(self, expr: Binary) -> Closure:
+        if expr.operands is not None:
+            return self.compileArithmetic(expr)
+
+        left: Closure = self.compileExpression(expr.left)
+        right: Closure = self.compileExpression(expr.right)
+        operator: Token = expr.operator
+
+        match operator.type:
+            case TokenType.OR:
+                def or_(environment: Environment) -> Any:
+                    value = left(environment)
+
+                    if value is not None and value is not False:
+                        return value
+
+                    return right(environment)
+
+                return or_
+
+            case TokenType.AND:
+                def and_(environment: Environment) -> Any:
+                    value = left(environment)
+
+                    if value is None or value is False:
+                        return value
+
+                    return right(environment)
+
+                return and_
+
+            case TokenType.BANG_EQUAL:
+                def notEqual(environment: Environment) -> bool:
+                    return left(environment) != right(environment)
+
+                return notEqual
+
+            case TokenType.EQUAL_EQUAL:
+                def equal(environment: Environment) -> bool:
+                    return left(environment) == right(environment)
+
+                return equal
+
+            case TokenType.PLUS:
+                def add(environment: Environment) -> Any:
+                    a = left(environment)
+                    b = right(environment)
+
+                    if type(a) is float and type(b) is float: return a + b
+                    if type(a) is str and type(b) is str: return a + b
+                    raise RuntimeError(operator, 'Operands must be two numbers or two strings')
+
+                return add
+
+        # Number-only (currently) operations
+
+        def numbers(environment: Environment) -> tuple[float, float]:
+            a = left(environment)
+            b = right(environment)
+
+            if not(type(a) is float and type(b) is float):
+                raise RuntimeError(operator, 'Operands must be numbers')
+
+            return a, b
+
+        match operator.type:
+            case TokenType.MINUS:
+                def subtract(environment: Environment) -> float:
+                    a, b = numbers(environment)
+                    return a - b
+
+                return subtract
+
+            case TokenType.SLASH:
+                def divide(environment: Environment) -> float:
+                    a, b = numbers(environment)
+                    return a / b
+
+                return divide
+
+            case TokenType.STAR:
+                def multiply(environment: Environment) -> float:
+                    a, b = numbers(environment)
+                    return a * b
+
+                return multiply
+
+            case TokenType.GREATER:
+                def greater(environment: Environment) -> bool:
+                    a, b = numbers(environment)
+                    return a > b
+
+                return greater
+
+            case TokenType.GREATER_EQUAL:
+                def greaterEqual(environment: Environment) -> bool:
+                    a, b = numbers(environment)
+                    return a >= b
+
+                return greaterEqual
+
+            case TokenType.LESS:
+                def less(environment: Environment) -> bool:
+                    a, b = numbers(environment)
+                    return a < b
+
+                return less
+
+            case TokenType.LESS_EQUAL:
+                def lessEqual(environment: Environment) -> bool:
+                    a, b = numbers(environment)
+                    return a <= b
+
+                return lessEqual
+
+    def compileArithmetic(self, expr: Binary) -> Closure:
+        # Only operands inference is unsure of are checked, a literal on the right is read straight from the node
+        left: Closure = self.compileExpression(expr.left)
+        right: Closure = self.compileExpression(expr.right)
+        operands: type = expr.operands
+        operation: Any = OPERATIONS[expr.operator.type]
+        operator: Token = expr.operator
+
+        def mismatch(a: Any, b: Any) -> Any:
+            # What the generic path does with operands that failed their guard
+            if operator.type == TokenType.PLUS:
+                if type(a) is type(b) and (type(a) is float or type(a) is str): return a + b
+                raise RuntimeError(operator, 'Operands must be two numbers or two strings')
+
+            raise RuntimeError(operator, 'Operands must be numbers')
+
+        if expr.guardLeft and expr.guardRight:
+            def arithmetic(environment: Environment) -> Any:
+                a = left(environment)
+                b = right(environment)
+
+                if type(a) is operands and type(b) is operands: return operation(a, b)
+                return mismatch(a, b)
+
+            return arithmetic
+
+        if expr.guardRight:
+            def arithmeticCheckRight(environment: Environment) -> Any:
+                a = left(environment)
+                b = right(environment)
+
+                if type(b) is operands: return operation(a, b)
+                return mismatch(a, b)
+
+            return arithmeticCheckRight
+
+        if isinstance(expr.right, Literal):
+            constant: Any = expr.right.value
+
+            if expr.guardLeft:
+                def arithmeticCheckLeftConstant(environment: Environment) -> Any:
+                    a = left(environment)
+
+                    if type(a) is operands: return operation(a, constant)
+                    return mismatch(a, constant)
+
+                return arithmeticCheckLeftConstant
+
+            def arithmeticConstant(environment: Environment) -> Any:
+                return operation(left(environment), constant)
+
+            return arithmeticConstant
+
+        if expr.guardLeft:
+            def arithmeticCheckLeft(environment: Environment) -> Any:
+                a = left(environment)
+                b = right(environment)
+
+                if type(a) is operands: return operation(a, b)
+                return mismatch(a, b)
+
+            return arithmeticCheckLeft
+
+        def arithmeticUnchecked(environment: Environment) -> Any:
+            return operation(left(environment), right(environment))
+
+        return arithmeticUnchecked
+
+    @override
+    def visitCallExpr(self, expr: Call) -> Closure:
+        callee: Closure = self.compileExpression(expr.callee)
+        arguments: List[Closure] = [self.compileExpression(argument) for argument in expr.arguments]
+        count: int = len(arguments)
+        paren: Token = expr.paren
+        tail: bool = expr.tail
+
+        def call(environment: Environment) -> Any:
+            function = callee(environment)
+
+            try:
+                if not function.minArity <= count <= function.maxArity:
+                    raise RuntimeError(paren, function.arityMessage(count))
+
+            except AttributeError:
+                raise RuntimeError(paren, 'Can only call functions and classes') from None
+
+            values: List[Any] = [argument(environment) for argument in arguments]
+
+            if type(function) is FunctionCall:
+                if tail and not function.isInitializer:
+                    self.tailCall = (function, values)
+                    return TAIL_CALL
+
+                return self.callFunction(function, values, paren)
+
+            if type(function) is ClassCall:
+                instance: Instance = Instance(function)
+                initializer: FunctionCall = function.initializer
+
+                if initializer is not None:
+                    self.callFunction(initializer.bind(instance), values, paren)
+
+                return instance
+
+            return function.function(*values)
+
+        return call
+
+    @override
+    def visitGetExpr(self, expr: Get) -> Closure:
+        object: Closure = self.compileExpression(expr.object)
+        name: Token = expr.name
+
+        def get(environment: Environment) -> Any:
+            instance = object(environment)
+
+            if isinstance(instance, Instance):
+                if instance.shape is expr.shape:
+                    if expr.index is not None:
+                        return instance.values[expr.index]
+
+                    return instance.getMethod(name)
+
+                return instance.getProperty(expr)
+
+            raise RuntimeError(name, 'Only instances have properties')
+
+        return get
+
+    @override
+    def visitSetExpr(self, expr: Set) -> Closure:
+        object: Closure = self.compileExpression(expr.object)
+        value: Closure = self.compileExpression(expr.value)
+        name: Token = expr.name
+
+        def set(environment: Environment) -> Any:
+            instance = object(environment)
+
+            if not isinstance(instance, Instance):
+                raise RuntimeError(name, 'Only instances have fields')
+
+            result = value(environment)
+
+            if instance.shape is expr.shape and expr.transition is None:
+                instance.values[expr.index] = result
+
+            else:
+                instance.setProperty(expr, result)
+
+            return result
+
+        return set
+
+    @override
+    def visitSuperExpr(self, expr: Super) -> Closure:
+        distance: int = expr.depth
+        method: Token = expr.method
+
+        def super_(environment: Environment) -> FunctionCall:
+            superclass: ClassCall = environment.getAt(distance, 0)
+            object: Instance = environment.getAt(distance - 1, 0)
+
+            function: FunctionCall = superclass.findMethod(method.lexeme)
+
+            if function is None:
+                raise RuntimeError(method, f'Undefined property {method.lexeme}')
+
+            return function.bind(object)
+
+        return super_
+
+    @override
+    def visitThisExpr(self, expr: This) -> Closure:
+        return self.compileVariable(expr.keyword, expr.depth, expr.slot)
+
+    @override
+    def visitVariableExpr(self, expr: Variable) -> Closure:
+        return self.compileVariable(expr.name, expr.depth, expr.slot)
+
+    @override
+    def visitAssignExpr(self, expr: Assign) -> Closure:
+        value: Closure = self.compileExpression(expr.value)
+        distance: int = expr.depth
+        slot: int = expr.slot
+        name: Token = expr.name
+
+        if distance is None:
+            globals: Environment = self.globals
+
+            def assignGlobal(environment: Environment) -> Any:
+                result = value(environment)
+                globals.assign(name, result)
+                return result
+
+            return assignGlobal
+
+        def assignLocal(environment: Environment) -> Any:
+            result = value(environment)
+
+            for _ in range(distance):
+                environment = environment.enclosing
+
+            environment.slots[slot] = result
+            return result
+
+        return assignLocal
+
+    # Helpers
+
+    def compileExpression(self, expr: Expr) -> Closure:
+        return expr.accept(self)
+
+    def compileStatement(self, stmt: Stmt) -> Closure:
+        return stmt.accept(self)
+
+    def compileBody(self, statements: List[Stmt]) -> Closure:
+        compiled: List[Closure] = [self.compileStatement(statement) for statement in statements]
+
+        if len(compiled) == 1:
+            return compiled[0]
+
+        # Statements return RETURNED once a Wiz return ran, so it unwinds to the call without raising
+        def body(environment: Environment) -> object:
+            for statement in compiled:
+                if statement(environment) is RETURNED:
+                    return RETURNED
+
+            return None
+
+        return body
+
+    def compileVariable(self, name: Token, distance: int, slot: int) -> Closure:
+        lexeme: str = name.lexeme
+
+        if distance is None:
+            globals: Environment = self.globals
+            values: dict[str, Any] = globals.values
+
+            def getGlobal(environment: Environment) -> Any:
+                if lexeme in values:
+                    return values[lexeme]
+
+                return globals.get(name)
+
+            return getGlobal
+
+        if distance == 0:
+            def getLocal(environment: Environment) -> Any:
+                return environment.slots[slot]
+
+            return getLocal
+
+        if distance == 1:
+            def getEnclosing(environment: Environment) -> Any:
+                return environment.enclosing.slots[slot]
+
+            return getEnclosing
+
+        def getAncestor(environment: Environment) -> Any:
+            for _ in range(distance):
+                environment = environment.enclosing
+
+            return environment.slots[slot]
+
+        return getAncestor
+
+    def callFunction(self, function: FunctionCall, arguments: List[Any], paren: Token) -> Any:
+        depth: int = self.callDepth
+
+        if depth >= self.maxCallDepth:
+            raise RuntimeError(paren, 'Maximum call depth exceeded')
+
+        # Only restored on a normal return, a runtime error ends the whole run and interpret resets it
+        self.callDepth = depth + 1
+        callee: FunctionCall = function
+        value: Any = None
+
+        # Calls in tail position come back here and run in the same Python frame, without a new call level
+        while True:
+            environment: Environment = Environment(callee.closure, callee.declaration.size)
+            environment.slots[:len(arguments)] = arguments
+
+            try:
+                completion: object = callee.compiled(environment)
+
+            except RecursionError:
+                # Deeply nested code inside the calls can still use up Python's frames first
+                raise RuntimeError(paren, 'Maximum call depth exceeded') from None
+
+            if completion is not RETURNED:
+                value = None
+                break
+
+            value = self.returnValue
+
+            if value is not TAIL_CALL:
+                break
+
+            callee, arguments = self.tailCall
+
+        self.callDepth = depth
+
+        if function.isInitializer:
+            return function.closure.slots[0]
+
+        return value
+
+    def declare(self, environment: Environment, name: Token, slot: int, value: Any) -> None:
+        if slot is None:
+            environment.define(name.lexeme, value)
+
+        else:
+            environment.slots[slot] = value
+
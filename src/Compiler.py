@@ -0,0 +1,279 @@
+from Expr import Expr, Literal, Unary, Grouping, Binary, Variable, Assign, Call, Get, Set, This, Super
+from Stmt import Stmt, Expression, Var, Block, If, While, For, Function, Return, Class
+from Chunk import Chunk
+from OpCode import OpCode
+from TokenType import TokenType
+from Token import Token
+from typing import Any, List, override
+
+class Compiler(Expr.Visitor, Stmt.Visitor):
+    def __init__(self) -> None:
+        self.chunk: Chunk
+
+    def compile(self, statements: List[Stmt], isREPL: bool) -> Chunk:
+        self.chunk = Chunk('script')
+
+        for statement in statements:
+            self.compileStatement(statement)
+
+            if isREPL and isinstance(statement, Expression):
+                self.compileExpression(statement.expression)
+                self.emit(OpCode.PRINT)
+
+        self.emit(OpCode.HALT)
+
+        return self.chunk
+
+    # Statements
+
+    @override
+    def visitExpressionStmt(self, stmt: Expression) -> None:
+        self.compileExpression(stmt.expression)
+        self.emit(OpCode.POP)
+
+    @override
+    def visitIfStmt(self, stmt: If) -> None:
+        self.compileExpression(stmt.condition)
+        elseJump: int = self.emit(OpCode.JUMP_IF_FALSE)
+
+        self.compileStatement(stmt.thenBranch)
+
+        if stmt.elseBranch is None:
+            self.patchJump(elseJump)
+            return
+
+        endJump: int = self.emit(OpCode.JUMP)
+        self.patchJump(elseJump)
+        self.compileStatement(stmt.elseBranch)
+        self.patchJump(endJump)
+
+    @override
+    def visitWhileStmt(self, stmt: While) -> None:
+        loopStart: int = len(self.chunk.code)
+
+        self.compileExpression(stmt.condition)
+        exitJump: int = self.emit(OpCode.JUMP_IF_FALSE)
+
+        self.compileStatement(stmt.body)
+        self.emit(OpCode.JUMP, loopStart)
+
+        self.patchJump(exitJump)
+
+    @override
+    def visitForStmt(self, stmt: For) -> None:
+        self.compileExpression(stmt.start)
+        self.compileExpression(stmt.end)
+
+        # Opens the loop's scope, holding the loop variable and the end in a hidden second slot
+        exitJump: int = self.emit(OpCode.FOR_ENTER, 0, self.constant(stmt))
+        loopStart: int = len(self.chunk.code)
+
+        self.compileStatement(stmt.body)
+
+        # Functions declared in the body keep the scope they closed over, so the next iteration gets a new one
+        self.emit(OpCode.FOR_NEXT_FRESH if stmt.perIteration else OpCode.FOR_NEXT, loopStart, self.constant(stmt.name))
+
+        self.patchJump(exitJump)
+        self.emit(OpCode.POP_SCOPE)
+
+    @override
+    def visitVarStmt(self, stmt: Var) -> None:
+        if stmt.initializer is not None:
+            self.compileExpression(stmt.initializer)
+
+        else:
+            self.emit(OpCode.NONE)
+
+        self.compileDeclaration(stmt.name, stmt.slot)
+
+    @override
+    def visitFunctionStmt(self, stmt: Function) -> None:
+        self.emit(OpCode.FUNCTION, self.constant((stmt, self.compileFunction(stmt))))
+        self.compileDeclaration(stmt.name, stmt.slot)
+
+    @override
+    def visitReturnStmt(self, stmt: Return) -> None:
+        if stmt.value is not None:
+            self.compileExpression(stmt.value)
+
+        else:
+            self.emit(OpCode.NONE)
+
+        self.emit(OpCode.RETURN)
+
+    @override
+    def visitClassStmt(self, stmt: Class) -> None:
+        if stmt.superclass is not None:
+            self.compileExpression(stmt.superclass)
+
+        else:
+            self.emit(OpCode.NONE)
+
+        methods: List[tuple[Function, Chunk]] = [(method, self.compileFunction(method)) for method in stmt.methods]
+
+        self.emit(OpCode.CLASS, self.constant((stmt, methods)))
+
+    @override
+    def visitBlockStmt(self, stmt: Block) -> None:
+        if stmt.size == 0:
+            for statement in stmt.statements:
+                self.compileStatement(statement)
+
+            return
+
+        self.emit(OpCode.PUSH_SCOPE, stmt.size)
+
+        for statement in stmt.statements:
+            self.compileStatement(statement)
+
+        self.emit(OpCode.POP_SCOPE)
+
+    # Expressions
+
+    @override
+    def visitLiteralExpr(self, expr: Literal) -> None:
+        if expr.value is None:
+            self.emit(OpCode.NONE)
+
+        else:
+            self.emit(OpCode.CONSTANT, self.constant(expr.value))
+
+    @override
+    def visitUnaryExpr(self, expr: Unary) -> None:
+        self.compileExpression(expr.right)
+
+        match expr.operator.type:
+            case TokenType.NOT: self.emit(OpCode.NOT)
+            case TokenType.MINUS: self.emit(OpCode.NEGATE, self.constant(expr.operator))
+
+    @override
+    def visitGroupingExpr(self, expr: Grouping) -> None:
+        self.compileExpression(expr.expression)
+
+    @override
+    def visitBinaryExpr(self, expr: Binary) -> None:
+        self.compileExpression(expr.left)
+
+        match expr.operator.type:
+            case TokenType.OR:
+                endJump: int = self.emit(OpCode.JUMP_IF_TRUE_KEEP)
+                self.emit(OpCode.POP)
+                self.compileExpression(expr.right)
+                self.patchJump(endJump)
+                return
+
+            case TokenType.AND:
+                endJump: int = self.emit(OpCode.JUMP_IF_FALSE_KEEP)
+                self.emit(OpCode.POP)
+                self.compileExpression(expr.right)
+                self.patchJump(endJump)
+                return
+
+        self.compileExpression(expr.right)
+
+        operator: int = self.constant(expr.operator)
+
+        match expr.operator.type:
+            case TokenType.BANG_EQUAL: self.emit(OpCode.NOT_EQUAL)
+            case TokenType.EQUAL_EQUAL: self.emit(OpCode.EQUAL)
+            case TokenType.PLUS: self.emit(OpCode.ADD, operator)
+            case TokenType.MINUS: self.emit(OpCode.SUBTRACT, operator)
+            case TokenType.SLASH: self.emit(OpCode.DIVIDE, operator)
+            case TokenType.STAR: self.emit(OpCode.MULTIPLY, operator)
+            case TokenType.GREATER: self.emit(OpCode.GREATER, operator)
+            case TokenType.GREATER_EQUAL: self.emit(OpCode.GREATER_EQUAL, operator)
+            case TokenType.LESS: self.emit(OpCode.LESS, operator)
+            case TokenType.LESS_EQUAL: self.emit(OpCode.LESS_EQUAL, operator)
+
+    @override
+    def visitCallExpr(self, expr: Call) -> None:
+        self.compileExpression(expr.callee)
+
+        # Callee and arity are checked before any argument is evaluated, like the tree-walking interpreter
+        call: int = self.constant(expr)
+        self.emit(OpCode.CHECK_CALL, len(expr.arguments), call)
+
+        for argument in expr.arguments:
+            self.compileExpression(argument)
+
+        self.emit(OpCode.CALL, len(expr.arguments), call)
+
+    @override
+    def visitGetExpr(self, expr: Get) -> None:
+        self.compileExpression(expr.object)
+        self.emit(OpCode.GET_PROPERTY, self.constant(expr))
+
+    @override
+    def visitSetExpr(self, expr: Set) -> None:
+        self.compileExpression(expr.object)
+        self.emit(OpCode.CHECK_INSTANCE, self.constant(expr.name))
+        self.compileExpression(expr.value)
+        self.emit(OpCode.SET_PROPERTY, self.constant(expr))
+
+    @override
+    def visitSuperExpr(self, expr: Super) -> None:
+        self.emit(OpCode.GET_SUPER, expr.depth, self.constant(expr.method))
+
+    @override
+    def visitThisExpr(self, expr: This) -> None:
+        self.compileVariable(expr.keyword, expr.depth, expr.slot)
+
+    @override
+    def visitVariableExpr(self, expr: Variable) -> None:
+        self.compileVariable(expr.name, expr.depth, expr.slot)
+
+    @override
+    def visitAssignExpr(self, expr: Assign) -> None:
+        self.compileExpression(expr.value)
+
+        if expr.depth is not None:
+            self.emit(OpCode.SET_LOCAL, expr.depth, expr.slot)
+
+        else:
+            self.emit(OpCode.SET_GLOBAL, self.constant(expr.name))
+
+    # Helpers
+
+    def compileExpression(self, expr: Expr) -> None:
+        expr.accept(self)
+
+    def compileStatement(self, stmt: Stmt) -> None:
+        stmt.accept(self)
+
+    def compileFunction(self, function: Function) -> Chunk:
+        enclosing: Chunk = self.chunk
+        self.chunk = Chunk(function.name.lexeme)
+
+        for statement in function.body:
+            self.compileStatement(statement)
+
+        self.emit(OpCode.NONE)
+        self.emit(OpCode.RETURN)
+
+        chunk: Chunk = self.chunk
+        self.chunk = enclosing
+
+        return chunk
+
+    def compileVariable(self, name: Token, depth: int, slot: int) -> None:
+        if depth is not None:
+            self.emit(OpCode.GET_LOCAL, depth, slot)
+
+        else:
+            self.emit(OpCode.GET_GLOBAL, self.constant(name))
+
+    def compileDeclaration(self, name: Token, slot: int) -> None:
+        if slot is None:
+            self.emit(OpCode.DEFINE, self.constant(name.lexeme))
+
+        else:
+            self.emit(OpCode.DEFINE_LOCAL, slot)
+
+    def emit(self, op: OpCode, a: int = 0, b: int = 0) -> int:
+        return self.chunk.write(op, a, b)
+
+    def patchJump(self, index: int) -> None:
+        self.chunk.patch(index, len(self.chunk.code))
+
+    def constant(self, value: Any) -> int:
+        return self.chunk.addConstant(value)
@@ -3,6 +3,8 @@ from Token import Token
 from typing import Any, List, override
 
 class Expr(ABC):
+    __slots__ = ()
+
     class Visitor(ABC):
         @abstractmethod
         def visitAssignExpr(self, expr: "Assign"):
@@ -53,71 +55,102 @@ class Expr(ABC):
         pass
 
 class Assign(Expr):
+    __slots__ = ('name', 'value', 'depth', 'slot')
+
     def __init__(self, name: Token, value: Expr):
         self.name: Token = name
         self.value: Expr = value
+        self.depth: int = None
+        self.slot: int = None
 
     @override
     def accept(self, visitor: Expr.Visitor):
         return visitor.visitAssignExpr(self)
 
 class Binary(Expr):
+    __slots__ = ('left', 'operator', 'right', 'operands', 'guardLeft', 'guardRight')
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left: Expr = left
         self.operator: Token = operator
         self.right: Expr = right
+        self.operands: type = None
+        self.guardLeft: bool = None
+        self.guardRight: bool = None
 
     @override
     def accept(self, visitor: Expr.Visitor):
         return visitor.visitBinaryExpr(self)
 
 class Call(Expr):
+    __slots__ = ('callee', 'paren', 'arguments', 'tail')
+
     def __init__(self, callee: Expr, paren: Token, arguments: List[Expr]):
         self.callee: Expr = callee
         self.paren: Token = paren
         self.arguments: List[Expr] = arguments
+        self.tail: bool = None
 
     @override
     def accept(self, visitor: Expr.Visitor):
         return visitor.visitCallExpr(self)
 
 class Get(Expr):
+    __slots__ = ('object', 'name', 'shape', 'index')
+
     def __init__(self, object: Expr, name: Token):
         self.object: Expr = object
         self.name: Token = name
+        self.shape: Any = None
+        self.index: int = None
 
     @override
     def accept(self, visitor: Expr.Visitor):
         return visitor.visitGetExpr(self)
 
 class Set(Expr):
+    __slots__ = ('object', 'name', 'value', 'shape', 'index', 'transition')
+
     def __init__(self, object: Expr, name: Token, value: Expr):
         self.object: Expr = object
         self.name: Token = name
         self.value: Expr = value
+        self.shape: Any = None
+        self.index: int = None
+        self.transition: Any = None
 
     @override
     def accept(self, visitor: Expr.Visitor):
         return visitor.visitSetExpr(self)
 
 class Super(Expr):
+    __slots__ = ('keyword', 'method', 'depth', 'slot')
+
     def __init__(self, keyword: Token, method: Token):
         self.keyword: Token = keyword
         self.method: Token = method
+        self.depth: int = None
+        self.slot: int = None
 
     @override
     def accept(self, visitor: Expr.Visitor):
         return visitor.visitSuperExpr(self)
 
 class This(Expr):
+    __slots__ = ('keyword', 'depth', 'slot')
+
     def __init__(self, keyword: Token):
         self.keyword: Token = keyword
+        self.depth: int = None
+        self.slot: int = None
 
     @override
     def accept(self, visitor: Expr.Visitor):
         return visitor.visitThisExpr(self)
 
 class Grouping(Expr):
+    __slots__ = ('expression',)
+
     def __init__(self, expression: Expr):
         self.expression: Expr = expression
 
@@ -126,6 +159,8 @@ class Grouping(Expr):
         return visitor.visitGroupingExpr(self)
 
 class Literal(Expr):
+    __slots__ = ('value',)
+
     def __init__(self, value: Any):
         self.value: Any = value
 
@@ -134,6 +169,8 @@ class Literal(Expr):
         return visitor.visitLiteralExpr(self)
 
 class Unary(Expr):
+    __slots__ = ('operator', 'right')
+
     def __init__(self, operator: Token, right: Expr):
         self.operator: Token = operator
         self.right: Expr = right
@@ -143,8 +180,12 @@ class Unary(Expr):
         return visitor.visitUnaryExpr(self)
 
 class Variable(Expr):
+    __slots__ = ('name', 'depth', 'slot')
+
     def __init__(self, name: Token):
         self.name: Token = name
+        self.depth: int = None
+        self.slot: int = None
 
     @override
     def accept(self, visitor: Expr.Visitor):
@@ -1,53 +1,71 @@
 from Callable import Callable
 import Stmt
 from Environment import Environment
-from Return import Return_
+from Return import RETURNED, TAIL_CALL
 from language.Language import Language
-from TokenType import TokenType
 # from Instance import Instance
 from typing import Any, List, override
 
 class FunctionCall(Callable):
-    def __init__(self, declaration: Stmt.Function, closure: Environment, isInitializer: bool, language: Language) -> None:
+    # Methods are bound on every access, slots keep creating the bound function cheap
+    __slots__ = ('declaration', 'closure', 'isInitializer', 'language', 'compiled', 'minArity', 'maxArity')
+
+    def __init__(self, declaration: Stmt.Function, closure: Environment, isInitializer: bool, language: Language, compiled: Any = None) -> None:
         self.declaration: Stmt.Function = declaration
         self.closure: Environment = closure
         self.isInitializer: bool = isInitializer
         self.language: Language = language
+        # Body as compiled by the bytecode or closure backend, the tree-walking interpreter leaves it empty
+        self.compiled: Any = compiled
+        self.minArity: int = len(declaration.params)
+        self.maxArity: int = self.minArity
 
     def bind(self, instance: 'Instance') -> 'FunctionCall':
-        environment: Environment = Environment(self.closure)
-        environment.define(self.retriveKeyword(TokenType.THIS), instance)
+        environment: Environment = Environment(self.closure, 1)
+        environment.slots[0] = instance
         
-        return FunctionCall(self.declaration, environment, self.isInitializer, self.language)
+        return FunctionCall(self.declaration, environment, self.isInitializer, self.language, self.compiled)
 
     @override
     def call(self, interpreter, arguments: List[Any]) -> Any:
-        environment: Environment = Environment(self.closure)
+        function: FunctionCall = self
+        value: Any = None
+        # Told of every call entered and left while a profiling tool runs, a call in tail position counting as its own
+        hook: Any = interpreter.callHook
 
-        for i in range(len(self.declaration.params)):
-            environment.define(self.declaration.params[i].lexeme, arguments[i])
+        if hook is not None:
+            hook.enterCall(function)
 
         try:
-            interpreter.executeBlock(self.declaration.body, environment)
-  
-        except Return_ as returnValue:
-            if self.isInitializer:
-                return self.closure.getAt(0, self.retriveKeyword(TokenType.THIS))
-            
-            return returnValue.value
-  
+            # Calls in tail position come back here and run in the same Python frame, without a new call level
+            while True:
+                environment: Environment = Environment(function.closure, function.declaration.size)
+                environment.slots[:len(arguments)] = arguments
+
+                if interpreter.executeBlock(function.declaration.body, environment) is not RETURNED:
+                    value = None
+                    break
+
+                value = interpreter.returnValue
+
+                if value is not TAIL_CALL:
+                    break
+
+                function, arguments = interpreter.tailCall
+
+                if hook is not None:
+                    hook.exitCall()
+                    hook.enterCall(function)
+
+        finally:
+            if hook is not None:
+                hook.exitCall()
+
         if self.isInitializer:
-            return self.closure.getAt(0, self.retriveKeyword(TokenType.THIS))
-  
-        return None
+            return self.closure.slots[0]
 
-    @override
-    def arity(self) -> int:
-        return len(self.declaration.params)
+        return value
 
     @override
     def __str__(self) -> str:
         return f'<function "{self.declaration.name.lexeme}">'
-
-    def retriveKeyword(self, type: TokenType) -> str:
-        return next((k for k, v in self.language.keywords.items() if v == type), None)
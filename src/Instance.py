@@ -2,17 +2,73 @@ from Token import Token
 from RuntimeError import RuntimeError
 # from ClassCall import ClassCall
 from FunctionCall import FunctionCall
-from typing import Any
+from Shape import Shape
+from Expr import Get, Set
+from typing import Any, List
 
 class Instance:
     def __init__(self, class_: 'ClassCall') -> None:
         self.class_: 'ClassCall' = class_
-        self.fields: dict[str, Any] = {}
+        self.shape: Shape = class_.shape
+        self.values: List[Any] = []
 
     def get(self, name: Token) -> Any:
-        if name.lexeme in  self.fields:
-            return self.fields[name.lexeme]
+        index: int = self.shape.fields.get(name.lexeme)
 
+        if index is not None:
+            return self.values[index]
+
+        return self.getMethod(name)
+
+    def set(self, name: Token, value: Any) -> None:
+        index: int = self.shape.fields.get(name.lexeme)
+
+        if index is not None:
+            self.values[index] = value
+            return
+
+        self.shape = self.shape.addField(name.lexeme)
+        self.values.append(value)
+
+    # Get and Set nodes remember the last shape they saw and where the field was in it,
+    # so while that shape keeps coming back the field is read or written by index
+
+    def getProperty(self, expr: Get) -> Any:
+        if expr.shape is not self.shape:
+            expr.shape = self.shape
+            expr.index = self.shape.fields.get(expr.name.lexeme)
+
+        if expr.index is not None:
+            return self.values[expr.index]
+
+        return self.getMethod(expr.name)
+
+    def setProperty(self, expr: Set, value: Any) -> None:
+        if expr.shape is self.shape:
+            if expr.transition is not None:
+                self.shape = expr.transition
+                self.values.append(value)
+
+            else:
+                self.values[expr.index] = value
+
+            return
+
+        expr.shape = self.shape
+        expr.index = self.shape.fields.get(expr.name.lexeme)
+        expr.transition = None
+
+        if expr.index is not None:
+            self.values[expr.index] = value
+            return
+
+        # A new field, later instances in the same shape take the same transition
+        expr.transition = self.shape.addField(expr.name.lexeme)
+        self.shape = expr.transition
+        self.values.append(value)
+
+    def getMethod(self, name: Token) -> FunctionCall:
+        # Every access binds anew, so two reads of a method are different functions, as they always were
         method: FunctionCall = self.class_.findMethod(name.lexeme)
 
         if method is not None:
@@ -20,8 +76,5 @@ class Instance:
 
         raise RuntimeError(name, f'Undefined property "{name.lexeme}"')
 
-    def set(self, name: Token, value: Any) -> None:
-        self.fields[name.lexeme] = value
-
     def __str__(self) -> str:
         return self.class_.name + ' instance'
@@ -1,12 +1,14 @@
 from Expr import Expr, Literal, Unary, Grouping, Binary, Variable, Assign, Call, Get, Set, This, Super
-from Stmt import Stmt, Expression, Var, Block, If, While, Function, Return, Class
+from Stmt import Stmt, Expression, Var, Block, If, While, For, Function, Return, Class
 
 from Environment import Environment
-from Callable import Callable
+from Callable import MAX_CALL_DEPTH
 from FunctionCall import FunctionCall
-from Return import Return_
+from Return import Return_, RETURNED, TAIL_CALL
 from ClassCall import ClassCall
 from Instance import Instance
+from Statistics import Statistics
+from TypeInference import OPERATIONS
 
 from TokenType import TokenType
 from Token import Token
@@ -17,23 +19,46 @@ from RuntimeError import RuntimeError
 from lib.StdLib import defineStdLib
 from language.Language import Language
 
+from sys import getrecursionlimit, setrecursionlimit
 from typing import Any, List, override
 
+# Python frames a Wiz call may take, so the call depth limit trips before Python's recursion limit
+FRAMES_PER_CALL: int = 50
+
 class Interpreter(Expr.Visitor, Stmt.Visitor):
-    def __init__(self, errorHandler: ErrorHandler, language: Language) -> None:
+    def __init__(self, errorHandler: ErrorHandler, language: Language, maxCallDepth: int = MAX_CALL_DEPTH) -> None:
         self.globals: Environment = Environment()
         self.environment: Environment = self.globals
-        self.locals: dict[Expr, int] = {}
 
         self.errorHandler = errorHandler
         self.language = language
 
+        self.maxCallDepth: int = maxCallDepth
+        self.callDepth: int = 0
+        setrecursionlimit(max(getrecursionlimit(), maxCallDepth * FRAMES_PER_CALL))
+
+        # Value of the last Wiz return, read by the call that receives RETURNED from its body
+        self.returnValue: Any = None
+        # Function and arguments of the last call in tail position, when the return value is TAIL_CALL
+        self.tailCall: tuple[FunctionCall, List[Any]] = None
+        # Profiling tool whose enterCall and exitCall FunctionCall.call reports Wiz calls to, None when nothing listens
+        self.callHook: Any = None
+        # Runs every statement in place of execute while a tool listens, see setStatementHook
+        self.statementHook: Any = None
+
+        # Counters of the work done while statistics are collected, and what undoes their instrumentation
+        self.statistics: Statistics = None
+        self.restoreCounted: Any = None
+
         defineStdLib(self.globals, self.language)
 
     def interpret(self, statements: List[Stmt], isREPL: bool) -> None:
+        self.callDepth = 0
+
         try:
             for statement in statements:
-                self.execute(statement)
+                if self.execute(statement) is RETURNED:
+                    raise Return_(self.returnValue)
 
                 if isREPL:
                     if isinstance(statement, Expression):
@@ -42,6 +67,66 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         except RuntimeError as error:
             self.errorHandler.runtimeError(error)
 
+    # Statistics
+
+    def startStatistics(self) -> Statistics:
+        # Counts the work done by the following runs until stopStatistics, the counters can be read at any time.
+        # Some are counted on shared classes, so work done meanwhile by other interpreters is counted too
+        if self.statistics is None:
+            self.statistics = Statistics()
+            self.restoreCounted = self.statistics.instrument(self)
+
+        return self.statistics
+
+    def stopStatistics(self) -> Statistics:
+        statistics: Statistics = self.statistics
+
+        if statistics is not None:
+            self.restoreCounted()
+            self.statistics = None
+            self.restoreCounted = None
+
+        return statistics
+
+    # Statement hook
+
+    def setStatementHook(self, hook: Any) -> None:
+        # Every statement is then run by hook(stmt), which runs it with stmt.accept(self), until the hook is set to None.
+        # The hooked methods shadow the plain ones on this instance only, so runs without a hook keep the direct loops
+        if self.statementHook is not None:
+            del self.execute
+            del self.executeBlock
+            del self.visitBlockStmt
+
+        self.statementHook = hook
+
+        if hook is not None:
+            self.execute = hook
+            self.executeBlock = self.hookedExecuteBlock
+            self.visitBlockStmt = self.hookedBlockStmt
+
+    def hookedExecuteBlock(self, statements: List[Stmt], environment: Environment) -> object:
+        previous: Environment = self.environment
+        hook: Any = self.statementHook
+
+        try:
+            self.environment = environment
+
+            for statement in statements:
+                if hook(statement) is RETURNED:
+                    return RETURNED
+
+            return None
+
+        finally:
+            self.environment = previous
+
+    def hookedBlockStmt(self, stmt: Block) -> object:
+        if stmt.size == 0:
+            return self.hookedExecuteBlock(stmt.statements, self.environment)
+
+        return self.hookedExecuteBlock(stmt.statements, Environment(self.environment, stmt.size))
+
     # Statements
     
     @override
@@ -49,17 +134,52 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         self.evaluate(stmt.expression)
 
     @override
-    def visitIfStmt(self, stmt: If) -> None:
+    def visitIfStmt(self, stmt: If) -> object:
         if self.isTrue(self.evaluate(stmt.condition)):
-            self.execute(stmt.thenBranch)
+            return self.execute(stmt.thenBranch)
 
         elif stmt.elseBranch is not None:
-            self.execute(stmt.elseBranch)
+            return self.execute(stmt.elseBranch)
+
+        return None
 
     @override
-    def visitWhileStmt(self, stmt: While):
+    def visitWhileStmt(self, stmt: While) -> object:
         while self.isTrue(self.evaluate(stmt.condition)):
-            self.execute(stmt.body)
+            if self.execute(stmt.body) is RETURNED:
+                return RETURNED
+
+        return None
+
+    @override
+    def visitForStmt(self, stmt: For) -> object:
+        start: Any = self.evaluate(stmt.start)
+        end: Any = self.evaluate(stmt.end)
+
+        if type(start) is not float or type(end) is not float:
+            raise RuntimeError(stmt.keyword, 'Loop bounds must be numbers')
+
+        loop: Environment = Environment(self.environment, 1)
+        loop.slots[0] = start
+
+        statements: List[Stmt] = stmt.body.statements
+        size: int = stmt.body.size
+        perIteration: bool = stmt.perIteration
+
+        while loop.slots[0] <= end:
+            if self.executeBlock(statements, Environment(loop, size) if size else loop) is RETURNED:
+                return RETURNED
+
+            counter: Any = loop.slots[0]
+
+            if type(counter) is not float:
+                raise RuntimeError(stmt.name, 'Loop variable must be a number')
+
+            # Functions declared in the body keep the scope they closed over, the next iteration gets a new one
+            if perIteration:
+                loop = Environment(self.environment, 1)
+
+            loop.slots[0] = counter + 1
 
         return None
 
@@ -70,21 +190,22 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         if stmt.initializer is not None:
             value = self.evaluate(stmt.initializer)
 
-        self.environment.define(stmt.name.lexeme, value)
+        self.declare(stmt.name, stmt.slot, value)
 
     @override
     def visitFunctionStmt(self, stmt: Function) -> None:
         function: FunctionCall = FunctionCall(stmt, self.environment, False, self.language)
-        self.environment.define(stmt.name.lexeme, function)
+        self.declare(stmt.name, stmt.slot, function)
 
     @override
-    def visitReturnStmt(self, stmt: Return) -> None:
+    def visitReturnStmt(self, stmt: Return) -> object:
         value: Any = None
 
         if stmt.value is not None:
             value = self.evaluate(stmt.value)
 
-        raise Return_(value)
+        self.returnValue = value
+        return RETURNED
 
     @override
     def visitClassStmt(self, stmt: Class) -> None:
@@ -96,16 +217,16 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
             if not isinstance(superclass, ClassCall):
                 raise RuntimeError(stmt.superclass.name, 'Superclass must be a class')
 
-        self.environment.define(stmt.name.lexeme, None)
+        self.declare(stmt.name, stmt.slot, None)
 
         if stmt.superclass is not None:
-            self.environment = Environment(self.environment)
-            self.environment.define(self.retriveKeyword(TokenType.SUPER), superclass)
+            self.environment = Environment(self.environment, 1)
+            self.environment.slots[0] = superclass
 
         methods: dict[str, FunctionCall] = {}
 
         for method in stmt.methods:
-            function: FunctionCall = FunctionCall(method, self.environment, method.name.lexeme == 'init', self.language)
+            function: FunctionCall = FunctionCall(method, self.environment, method.name.lexeme == self.language.initName, self.language)
             methods[method.name.lexeme] = function
 
         class_ = ClassCall(stmt.name.lexeme, superclass, methods)
@@ -113,11 +234,18 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
         if superclass is not None:
             self.environment = self.environment.enclosing
 
-        self.environment.assign(stmt.name, class_)
+        self.declare(stmt.name, stmt.slot, class_)
 
     @override
-    def visitBlockStmt(self, stmt: Block) -> None:
-        self.executeBlock(stmt.statements, Environment(self.environment))
+    def visitBlockStmt(self, stmt: Block) -> object:
+        if stmt.size == 0:
+            for statement in stmt.statements:
+                if statement.accept(self) is RETURNED:
+                    return RETURNED
+
+            return None
+
+        return self.executeBlock(stmt.statements, Environment(self.environment, stmt.size))
 
     # Expressions
 
@@ -145,6 +273,18 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
 
     @override
     def visitBinaryExpr(self, expr: Binary) -> Any:
+        operands: type = expr.operands
+
+        # Inference settled the operand types, guarding them is enough to run the operation directly
+        if operands is not None:
+            left: Any = self.evaluate(expr.left)
+            right: Any = self.evaluate(expr.right)
+
+            if type(left) is operands and type(right) is operands:
+                return OPERATIONS[expr.operator.type](left, right)
+
+            return self.operate(expr, left, right)
+
         left: Any = self.evaluate(expr.left)
 
         match expr.operator.type:
@@ -160,8 +300,9 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
                 else:
                     return self.evaluate(expr.right)
 
-        right: Any = self.evaluate(expr.right)
+        return self.operate(expr, left, self.evaluate(expr.right))
 
+    def operate(self, expr: Binary, left: Any, right: Any) -> Any:
         match expr.operator.type:
             case TokenType.BANG_EQUAL: return left != right
             case TokenType.EQUAL_EQUAL: return left == right
@@ -187,29 +328,60 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
     @override
     def visitCallExpr(self, expr: Call) -> Any:
         callee: Any = self.evaluate(expr.callee)
+        count: int = len(expr.arguments)
 
-        if not isinstance(callee, Callable):
-            raise RuntimeError(expr.paren, 'Can only call functions and classes')
-
-        if hasattr(callee, 'checkArity'):
-            callee.checkArity(expr.arguments, expr)
+        # Anything declaring an arity range can be called
+        try:
+            if not callee.minArity <= count <= callee.maxArity:
+                raise RuntimeError(expr.paren, callee.arityMessage(count))
 
-        if len(expr.arguments) != callee.arity():
-            raise RuntimeError(expr.paren, f'Expected {callee.arity()} argument(s) but got {len(expr.arguments)}')
+        except AttributeError:
+            raise RuntimeError(expr.paren, 'Can only call functions and classes') from None
 
         arguments: List[Any] = []
 
         for argument in expr.arguments:
             arguments.append(self.evaluate(argument))
 
-        return callee.call(self, arguments)
+        if type(callee) is FunctionCall:
+            if expr.tail and not callee.isInitializer:
+                self.tailCall = (callee, arguments)
+                return TAIL_CALL
+
+        # Natives never run Wiz code, so they take no call level
+        elif type(callee) is not ClassCall:
+            return callee.function(*arguments)
+
+        depth: int = self.callDepth
+
+        if depth >= self.maxCallDepth:
+            raise RuntimeError(expr.paren, 'Maximum call depth exceeded')
+
+        # Only restored on a normal return, a runtime error ends the whole run and interpret resets it
+        self.callDepth = depth + 1
+
+        try:
+            value: Any = callee.call(self, arguments)
+
+        except RecursionError:
+            # Deeply nested code inside the calls can still use up Python's frames first
+            raise RuntimeError(expr.paren, 'Maximum call depth exceeded') from None
+
+        self.callDepth = depth
+        return value
 
     @override
     def visitGetExpr(self, expr: Get) -> Any:
         object: Any = self.evaluate(expr.object)
 
         if isinstance(object, Instance):
-            return object.get(expr.name)
+            if object.shape is expr.shape:
+                if expr.index is not None:
+                    return object.values[expr.index]
+
+                return object.getMethod(expr.name)
+
+            return object.getProperty(expr)
 
         raise RuntimeError(expr.name, 'Only instances have properties')
 
@@ -221,16 +393,20 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
             raise RuntimeError(expr.name, 'Only instances have fields')
 
         value = self.evaluate(expr.value)
-        object.set(expr.name, value)
+
+        if object.shape is expr.shape and expr.transition is None:
+            object.values[expr.index] = value
+
+        else:
+            object.setProperty(expr, value)
 
         return value
 
     @override
     def visitSuperExpr(self, expr: Super) -> FunctionCall:
-        distance: int = self.locals[expr]
-
-        superclass: ClassCall = self.environment.getAt(distance, self.retriveKeyword(TokenType.SUPER))
-        object: Instance = self.environment.getAt(distance - 1, self.retriveKeyword(TokenType.THIS))
+        # "super" and "this" are alone in their scopes, so both are in slot 0
+        superclass: ClassCall = self.environment.getAt(expr.depth, 0)
+        object: Instance = self.environment.getAt(expr.depth - 1, 0)
 
         method: FunctionCall = superclass.findMethod(expr.method.lexeme)
 
@@ -241,20 +417,18 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
 
     @override
     def visitThisExpr(self, expr: This) -> Any:
-        return self.lookUpVariable(expr.keyword, expr)
+        return self.lookUpVariable(expr.keyword, expr.depth, expr.slot)
 
     @override
     def visitVariableExpr(self, expr: Variable) -> Any:
-        return self.lookUpVariable(expr.name, expr)
+        return self.lookUpVariable(expr.name, expr.depth, expr.slot)
 
     @override
     def visitAssignExpr(self, expr: Assign):
         value: Any = self.evaluate(expr.value)
 
-        distance: int = self.locals.get(expr)
-        
-        if distance is not None:
-            self.environment.assignAt(distance, expr.name, value)
+        if expr.depth is not None:
+            self.environment.assignAt(expr.depth, expr.slot, value)
 
         else:
             self.globals.assign(expr.name, value)
@@ -266,29 +440,35 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
     def evaluate(self, expr: Expr) -> Any:
         return expr.accept(self)
 
-    def execute(self, stmt: Stmt) -> None:
-        stmt.accept(self)
+    # Statements return RETURNED once a Wiz return ran, so it unwinds to the call without raising
+    def execute(self, stmt: Stmt) -> object:
+        return stmt.accept(self)
 
-    def executeBlock(self, statements: List[Stmt], environment: Environment) -> None:
+    def executeBlock(self, statements: List[Stmt], environment: Environment) -> object:
         previous: Environment = self.environment
 
         try:
             self.environment = environment
 
             for statement in statements:
-                self.execute(statement)
+                if statement.accept(self) is RETURNED:
+                    return RETURNED
+
+            return None
 
         finally:
             self.environment = previous
 
-    def resolve(self, expr: Expr, depth: int) -> None:
-        self.locals[expr] = depth
+    def declare(self, name: Token, slot: int, value: Any) -> None:
+        if slot is None:
+            self.environment.define(name.lexeme, value)
 
-    def lookUpVariable(self, name: Token, expr: Expr) -> Any:
-        distance: int = self.locals.get(expr)
-        
-        if distance is not None:
-            return self.environment.getAt(distance, name.lexeme)
+        else:
+            self.environment.slots[slot] = value
+
+    def lookUpVariable(self, name: Token, depth: int, slot: int) -> Any:
+        if depth is not None:
+            return self.environment.getAt(depth, slot)
 
         else:
             return self.globals.get(name)
@@ -301,6 +481,3 @@ class Interpreter(Expr.Visitor, Stmt.Visitor):
             return bool(object)
 
         return True
-
-    def retriveKeyword(self, type: TokenType) -> str:
-        return next((k for k, v in self.language.keywords.items() if v == type), None)
@@ -0,0 +1,35 @@
+from Stmt import Stmt, Block, Function, If, While, For, Class
+from typing import List
+
+class Labels:
+    # Names the profiling tools show for Wiz functions. Methods are shown with their class,
+    # which the call itself cannot tell, as it only knows the declaration
+    def __init__(self) -> None:
+        self.methods: dict[Function, str] = {}
+        # Line each class is declared on, the first declaration winning when a name is reused
+        self.classLines: dict[str, int] = {}
+
+    def nameOf(self, declaration: Function) -> str:
+        return self.methods.get(declaration) or declaration.name.lexeme
+
+    def label(self, statements: List[Stmt]) -> None:
+        for statement in statements:
+            match statement:
+                case Function():
+                    self.label(statement.body)
+
+                case Class():
+                    self.classLines.setdefault(statement.name.lexeme, statement.name.line)
+
+                    for method in statement.methods:
+                        self.methods[method] = f'{statement.name.lexeme}.{method.name.lexeme}'
+                        self.label(method.body)
+
+                case Block():
+                    self.label(statement.statements)
+
+                case If():
+                    self.label([statement.thenBranch] if statement.elseBranch is None else [statement.thenBranch, statement.elseBranch])
+
+                case While() | For():
+                    self.label([statement.body])
@@ -0,0 +1,130 @@
+from Stmt import Stmt
+from Interpreter import Interpreter
+from Lines import lineOf
+from time import perf_counter
+from typing import Any, List
+import json
+
+# Marks a statement not seen yet, None being the entry of statements without a line
+UNSEEN = object()
+
+class LineEntry:
+    __slots__ = ('line', 'hits', 'time')
+
+    def __init__(self, line: int) -> None:
+        self.line: int = line
+        self.hits: int = 0
+        # Time spent in statements starting on the line, without the statements nested in them or run by their calls
+        self.time: float = 0.0
+
+class LineProfiler:
+    # Counts and times every statement a program runs on the tree-walking interpreter, grouped by source line.
+    # Statements are timed by the interpreter's statement hook, set during the profiled run only
+    reportExtension: str = '.lines.json'
+
+    def __init__(self) -> None:
+        self.entries: dict[int, LineEntry] = {}
+        # Entry of each statement seen, None for those without a line of their own, like blocks
+        self.statements: dict[Stmt, LineEntry] = {}
+        self.source: List[str] = []
+        self.elapsed: float = 0.0
+
+    def run(self, interpreter: Interpreter, statements: List[Stmt], isREPL: bool) -> None:
+        self.source = interpreter.errorHandler.lines
+        restore = self.instrument(interpreter)
+        start: float = perf_counter()
+
+        try:
+            interpreter.interpret(statements, isREPL)
+
+        finally:
+            self.elapsed += perf_counter() - start
+            restore()
+
+    def instrument(self, interpreter: Interpreter) -> Any:
+        entries: dict[Stmt, LineEntry] = self.statements
+        entryOf = self.entryOf
+        # Time taken by the statements nested in each timed statement in progress
+        nested: List[float] = [0.0]
+
+        def profiledStatement(stmt: Stmt) -> object:
+            entry: LineEntry = entries.get(stmt, UNSEEN)
+
+            if entry is UNSEEN:
+                entry = entryOf(stmt)
+
+            # Statements without a line are not timed, the time of those inside them goes to the enclosing statement
+            if entry is None:
+                return stmt.accept(interpreter)
+
+            nested.append(0.0)
+            start: float = perf_counter()
+
+            try:
+                return stmt.accept(interpreter)
+
+            finally:
+                elapsed: float = perf_counter() - start
+                entry.hits += 1
+                entry.time += elapsed - nested.pop()
+                nested[-1] += elapsed
+
+        interpreter.setStatementHook(profiledStatement)
+
+        def restore() -> None:
+            interpreter.setStatementHook(None)
+
+        return restore
+
+    def entryOf(self, stmt: Stmt) -> LineEntry:
+        line: int = lineOf(stmt)
+        entry: LineEntry = None
+
+        if line is not None:
+            entry = self.entries.get(line)
+
+            if entry is None:
+                entry = self.entries[line] = LineEntry(line)
+
+        self.statements[stmt] = entry
+        return entry
+
+    def hottestEntries(self, count: int) -> List[LineEntry]:
+        return sorted(self.entries.values(), key=lambda entry: entry.time, reverse=True)[:count]
+
+    def printReport(self) -> None:
+        print(f'\nLine profile: {self.elapsed * 1000:.3f} ms\n')
+        print(f'{"line":>6} {"hits":>10} {"ms":>12} {"µs/hit":>10} {"%":>6}  source')
+
+        for line, text in enumerate(self.source, start=1):
+            entry: LineEntry = self.entries.get(line)
+
+            if entry is None:
+                print(f'{line:>6} {"":>10} {"":>12} {"":>10} {"":>6}  {text}')
+                continue
+
+            share: float = entry.time / self.elapsed * 100 if self.elapsed else 0.0
+            print(f'{line:>6} {entry.hits:>10} {entry.time * 1000:>12.3f} {entry.time / entry.hits * 1e6:>10.2f} {share:>5.1f}%  {text}')
+
+        print('\nHottest lines\n')
+
+        for entry in self.hottestEntries(10):
+            share: float = entry.time / self.elapsed * 100 if self.elapsed else 0.0
+            print(f'{entry.line:>6} {share:>5.1f}%  {self.source[entry.line - 1].strip()}')
+
+    def writeReport(self, path: str) -> None:
+        report: dict[str, Any] = {
+            'elapsed': self.elapsed,
+            'lines': [
+                {
+                    'line': entry.line,
+                    'hits': entry.hits,
+                    'time': entry.time,
+                    'source': self.source[entry.line - 1],
+                }
+                for entry in sorted(self.entries.values(), key=lambda entry: entry.line)
+            ],
+        }
+
+        with open(path, 'w', encoding='UTF-8') as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,34 @@
+from Stmt import Stmt, Expression, Var, If, While, For, Function, Return, Class
+from Expr import Expr, Unary, Grouping, Binary, Variable, Assign, Call, Get, Set, This, Super
+
+def lineOf(node: Stmt | Expr) -> int:
+    # Source line a node starts on, found from its first token. Blocks and nodes folded into literals have none
+    match node:
+        case Var() | Function() | Class() | Variable() | Assign():
+            return node.name.line
+
+        case For() | Return() | This() | Super():
+            return node.keyword.line
+
+        case Expression():
+            return lineOf(node.expression)
+
+        case If() | While():
+            return lineOf(node.condition)
+
+        case Binary():
+            return lineOf(node.left) or node.operator.line
+
+        case Call():
+            return lineOf(node.callee) or node.paren.line
+
+        case Get() | Set():
+            return lineOf(node.object) or node.name.line
+
+        case Unary():
+            return node.operator.line
+
+        case Grouping():
+            return lineOf(node.expression)
+
+    return None
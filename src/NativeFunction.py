@@ -0,0 +1,21 @@
+from Callable import Callable
+from abc import abstractmethod
+from typing import Any, List, override
+
+class NativeFunction(Callable):
+    # A function implemented in Python. Backends pass the arguments straight to function as positional parameters,
+    # and it keeps no state about the call in progress, so one instance can serve several interpreters
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+
+    @abstractmethod
+    def function(self, *arguments: Any) -> Any:
+        pass
+
+    @override
+    def call(self, interpreter, arguments: List[Any]) -> Any:
+        return self.function(*arguments)
+
+    @override
+    def __str__(self) -> str:
+        return f'<native function "{self.name}">'
@@ -0,0 +1,57 @@
+from enum import IntEnum, auto
+
+class OpCode(IntEnum):
+    # Constants and stack
+    CONSTANT = auto()
+    NONE = auto()
+    POP = auto()
+
+    # Variables
+    DEFINE = auto()
+    DEFINE_LOCAL = auto()
+    GET_LOCAL = auto()
+    SET_LOCAL = auto()
+    GET_GLOBAL = auto()
+    SET_GLOBAL = auto()
+
+    # Scopes
+    PUSH_SCOPE = auto()
+    POP_SCOPE = auto()
+
+    # Operators
+    NOT = auto()
+    NEGATE = auto()
+    EQUAL = auto()
+    NOT_EQUAL = auto()
+    ADD = auto()
+    SUBTRACT = auto()
+    MULTIPLY = auto()
+    DIVIDE = auto()
+    GREATER = auto()
+    GREATER_EQUAL = auto()
+    LESS = auto()
+    LESS_EQUAL = auto()
+
+    # Control flow
+    JUMP = auto()
+    JUMP_IF_FALSE = auto()
+    JUMP_IF_FALSE_KEEP = auto()
+    JUMP_IF_TRUE_KEEP = auto()
+    FOR_ENTER = auto()
+    FOR_NEXT = auto()
+    FOR_NEXT_FRESH = auto()
+
+    # Functions and classes
+    CHECK_CALL = auto()
+    CALL = auto()
+    FUNCTION = auto()
+    RETURN = auto()
+    CLASS = auto()
+    CHECK_INSTANCE = auto()
+    GET_PROPERTY = auto()
+    SET_PROPERTY = auto()
+    GET_SUPER = auto()
+
+    # Interactive shell
+    PRINT = auto()
+    HALT = auto()
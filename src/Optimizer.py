@@ -0,0 +1,219 @@
+from Expr import Expr, Variable, Assign, Binary, Call, Grouping, Literal, Unary, This, Set, Get, Super
+from Stmt import Stmt, Block, Var, Function, Expression, If, Return, While, For, Class
+from TokenType import TokenType
+from typing import Any, List, override
+
+# Runs on the resolved tree and rewrites it in place. Only operations that cannot fail are folded,
+# anything that would raise a runtime error, like adding a number to a string, is left for the backend to report
+
+ARITHMETIC: dict[TokenType, Any] = {
+    TokenType.MINUS: lambda left, right: left - right,
+    TokenType.STAR: lambda left, right: left * right,
+    TokenType.SLASH: lambda left, right: left / right,
+    TokenType.GREATER: lambda left, right: left > right,
+    TokenType.GREATER_EQUAL: lambda left, right: left >= right,
+    TokenType.LESS: lambda left, right: left < right,
+    TokenType.LESS_EQUAL: lambda left, right: left <= right,
+}
+
+class Optimizer(Expr.Visitor, Stmt.Visitor):
+    def optimizeStatements(self, statements: List[Stmt]) -> List[Stmt]:
+        optimized: List[Stmt] = []
+
+        for statement in statements:
+            statement = statement.accept(self)
+
+            if statement is None:
+                continue
+
+            optimized.append(statement)
+
+            # Nothing after a return can run
+            if isinstance(statement, Return):
+                break
+
+        return optimized
+
+    # Statements
+
+    @override
+    def visitBlockStmt(self, stmt: Block) -> Stmt:
+        stmt.statements = self.optimizeStatements(stmt.statements)
+        return stmt
+
+    @override
+    def visitVarStmt(self, stmt: Var) -> Stmt:
+        if stmt.initializer is not None:
+            stmt.initializer = self.optimize(stmt.initializer)
+
+        return stmt
+
+    @override
+    def visitFunctionStmt(self, stmt: Function) -> Stmt:
+        stmt.body = self.optimizeStatements(stmt.body)
+        return stmt
+
+    @override
+    def visitClassStmt(self, stmt: Class) -> Stmt:
+        for method in stmt.methods:
+            self.visitFunctionStmt(method)
+
+        return stmt
+
+    @override
+    def visitExpressionStmt(self, stmt: Expression) -> Stmt:
+        stmt.expression = self.optimize(stmt.expression)
+        return stmt
+
+    @override
+    def visitIfStmt(self, stmt: If) -> Stmt:
+        stmt.condition = self.optimize(stmt.condition)
+        stmt.thenBranch = stmt.thenBranch.accept(self)
+
+        if stmt.elseBranch is not None:
+            stmt.elseBranch = stmt.elseBranch.accept(self)
+
+        # The branch keeps its block, so a scope it declares stays where the resolver put it
+        if isinstance(stmt.condition, Literal):
+            return stmt.thenBranch if self.isTrue(stmt.condition.value) else stmt.elseBranch
+
+        return stmt
+
+    @override
+    def visitWhileStmt(self, stmt: While) -> Stmt:
+        stmt.condition = self.optimize(stmt.condition)
+
+        if isinstance(stmt.condition, Literal) and not self.isTrue(stmt.condition.value):
+            return None
+
+        stmt.body = stmt.body.accept(self)
+        return stmt
+
+    @override
+    def visitForStmt(self, stmt: For) -> Stmt:
+        stmt.start = self.optimize(stmt.start)
+        stmt.end = self.optimize(stmt.end)
+        stmt.body = stmt.body.accept(self)
+        return stmt
+
+    @override
+    def visitReturnStmt(self, stmt: Return) -> Stmt:
+        if stmt.value is not None:
+            stmt.value = self.optimize(stmt.value)
+
+        return stmt
+
+    # Expressions
+
+    @override
+    def visitLiteralExpr(self, expr: Literal) -> Expr:
+        return expr
+
+    @override
+    def visitGroupingExpr(self, expr: Grouping) -> Expr:
+        return self.optimize(expr.expression)
+
+    @override
+    def visitUnaryExpr(self, expr: Unary) -> Expr:
+        expr.right = self.optimize(expr.right)
+
+        if not isinstance(expr.right, Literal):
+            return expr
+
+        value: Any = expr.right.value
+
+        match expr.operator.type:
+            case TokenType.NOT:
+                return Literal(not self.isTrue(value))
+
+            case TokenType.MINUS if type(value) is float:
+                return Literal(-value)
+
+        return expr
+
+    @override
+    def visitBinaryExpr(self, expr: Binary) -> Expr:
+        expr.left = self.optimize(expr.left)
+        expr.right = self.optimize(expr.right)
+
+        if not isinstance(expr.left, Literal):
+            return expr
+
+        left: Any = expr.left.value
+
+        # Only the left operand decides whether the right one runs
+        match expr.operator.type:
+            case TokenType.OR:
+                return expr.left if self.isTrue(left) else expr.right
+
+            case TokenType.AND:
+                return expr.right if self.isTrue(left) else expr.left
+
+        if not isinstance(expr.right, Literal):
+            return expr
+
+        right: Any = expr.right.value
+
+        match expr.operator.type:
+            case TokenType.EQUAL_EQUAL:
+                return Literal(left == right)
+
+            case TokenType.BANG_EQUAL:
+                return Literal(left != right)
+
+            case TokenType.PLUS if type(left) is type(right) and type(left) in (float, str):
+                return Literal(left + right)
+
+        if type(left) is not float or type(right) is not float:
+            return expr
+
+        # Left in place so the program still fails where it did
+        if expr.operator.type == TokenType.SLASH and right == 0:
+            return expr
+
+        if expr.operator.type in ARITHMETIC:
+            return Literal(ARITHMETIC[expr.operator.type](left, right))
+
+        return expr
+
+    @override
+    def visitVariableExpr(self, expr: Variable) -> Expr:
+        return expr
+
+    @override
+    def visitAssignExpr(self, expr: Assign) -> Expr:
+        expr.value = self.optimize(expr.value)
+        return expr
+
+    @override
+    def visitCallExpr(self, expr: Call) -> Expr:
+        expr.callee = self.optimize(expr.callee)
+        expr.arguments = [self.optimize(argument) for argument in expr.arguments]
+        return expr
+
+    @override
+    def visitGetExpr(self, expr: Get) -> Expr:
+        expr.object = self.optimize(expr.object)
+        return expr
+
+    @override
+    def visitSetExpr(self, expr: Set) -> Expr:
+        expr.object = self.optimize(expr.object)
+        expr.value = self.optimize(expr.value)
+        return expr
+
+    @override
+    def visitThisExpr(self, expr: This) -> Expr:
+        return expr
+
+    @override
+    def visitSuperExpr(self, expr: Super) -> Expr:
+        return expr
+
+    # Helpers
+
+    def optimize(self, expr: Expr) -> Expr:
+        return expr.accept(self)
+
+    def isTrue(self, value: Any) -> bool:
+        return value is not None and value is not False
@@ -1,20 +1,22 @@
 from TokenType import TokenType
 from Token import Token
 from Expr import Expr, Binary, Unary, Literal, Grouping, Variable, Assign, Call, Get, Set, This, Super
-from Stmt import Stmt, Var, Expression, Block, If, While, Function, Return, Class
+from Stmt import Stmt, Var, Expression, Block, If, While, For, Function, Return, Class
 from ErrorHandler import ErrorHandler
 from ErrorType import ErrorType
-from typing import List
+from typing import Iterable, Iterator, List
 
 class Parser:
     class ParseError(RuntimeError):
         pass
 
-    def __init__(self, tokens: List[Token], errorHandler: ErrorHandler) -> None:
+    def __init__(self, tokens: Iterable[Token], errorHandler: ErrorHandler) -> None:
         self.errorHandler = errorHandler
 
-        self.tokens: List[Token] = tokens
-        self.current: int = 0
+        # Only the current and previous tokens are kept, so tokens can be streamed from the scanner
+        self.tokens: Iterator[Token] = iter(tokens)
+        self.currentToken: Token = next(self.tokens)
+        self.previousToken: Token = None
 
     def parse(self) -> List[Stmt]:
         statements: List[Stmt] = []
@@ -124,6 +126,22 @@ class Parser:
 
         return While(condition, body)
 
+    def forStatement(self) -> Stmt:
+        keyword: Token = self.previous()
+        name: Token = self.consume(TokenType.IDENTIFIER, 'Expect loop variable name after "for"')
+
+        self.consume(TokenType.FROM, 'Expect "from" after the loop variable of a "for" statement')
+        start: Expr = self.expression()
+
+        self.consume(TokenType.TO, 'Expect "to" after the start of a "for" statement')
+        end: Expr = self.expression()
+
+        self.consume(TokenType.BEGIN, 'Expect "begin" after the end of a "for" statement')
+
+        body: Block = Block(self.blockStatement())
+
+        return For(keyword, name, start, end, body)
+
     def returnStatement(self) -> Stmt:
         keyword: Token = self.previous()
         value: Expr = None
@@ -313,15 +331,16 @@ class Parser:
 
     def advance(self) -> Token:
         if not self.isAtEnd():
-            self.current += 1
+            self.previousToken = self.currentToken
+            self.currentToken = next(self.tokens)
 
         return self.previous()
 
     def peek(self) -> Token:
-        return self.tokens[self.current]
+        return self.currentToken
 
     def previous(self) -> Token:
-        return self.tokens[self.current - 1]
+        return self.previousToken
 
     def isAtEnd(self) -> bool:
         return self.peek().type == TokenType.EOF
@@ -0,0 +1,153 @@
+from Stmt import Stmt, Function
+from FunctionCall import FunctionCall
+from ClassCall import ClassCall
+from NativeFunction import NativeFunction
+from Interpreter import Interpreter
+from Labels import Labels
+from time import perf_counter
+from typing import Any, List
+import json
+
+class Entry:
+    __slots__ = ('name', 'line', 'calls', 'selfTime', 'totalTime', 'active')
+
+    def __init__(self, name: str, line: int) -> None:
+        self.name: str = name
+        self.line: int = line
+        self.calls: int = 0
+        self.selfTime: float = 0.0
+        self.totalTime: float = 0.0
+        # Invocations still running, a recursive call only adds to the total once the outermost one returns
+        self.active: int = 0
+
+class Profiler:
+    # Times Wiz functions, classes and natives on the tree-walking interpreter. Functions are reported through its call hook,
+    # classes and natives by wrapping their call entry points. Both only exist while a profiled program runs
+    reportExtension: str = '.profile.json'
+
+    def __init__(self) -> None:
+        self.entries: dict[tuple[str, int], Entry] = {}
+        # Entry, start time and time spent in nested calls of every call in progress
+        self.stack: List[list] = []
+        self.labels: Labels = Labels()
+        self.elapsed: float = 0.0
+
+    def run(self, interpreter: Interpreter, statements: List[Stmt], isREPL: bool) -> None:
+        self.labels.label(statements)
+        restore = self.instrument(interpreter)
+        start: float = perf_counter()
+
+        try:
+            interpreter.interpret(statements, isREPL)
+
+        finally:
+            self.elapsed += perf_counter() - start
+            restore()
+
+    def instrument(self, interpreter: Interpreter) -> Any:
+        profiler: Profiler = self
+        classCall = ClassCall.call
+
+        def profiledClassCall(class_: ClassCall, interpreter: Interpreter, arguments: List[Any]) -> Any:
+            profiler.enter(class_.name, profiler.labels.classLines.get(class_.name))
+
+            try:
+                return classCall(class_, interpreter, arguments)
+
+            finally:
+                profiler.exit()
+
+        interpreter.callHook = self
+        ClassCall.call = profiledClassCall
+
+        # Natives are wrapped on the instance, which shadows their class's function until the wrapper is deleted
+        natives: List[NativeFunction] = [value for value in interpreter.globals.values.values() if isinstance(value, NativeFunction)]
+
+        for native in natives:
+            native.function = self.wrapNative(native)
+
+        def restore() -> None:
+            interpreter.callHook = None
+            ClassCall.call = classCall
+
+            for native in natives:
+                del native.function
+
+        return restore
+
+    def wrapNative(self, native: NativeFunction) -> Any:
+        profiler: Profiler = self
+        function = native.function
+
+        def profiledNative(*arguments: Any) -> Any:
+            profiler.enter(native.name, None)
+
+            try:
+                return function(*arguments)
+
+            finally:
+                profiler.exit()
+
+        return profiledNative
+
+    def enterCall(self, function: FunctionCall) -> None:
+        declaration: Function = function.declaration
+        self.enter(self.labels.nameOf(declaration), declaration.name.line)
+
+    def exitCall(self) -> None:
+        self.exit()
+
+    def enter(self, name: str, line: int) -> None:
+        entry: Entry = self.entries.get((name, line))
+
+        if entry is None:
+            entry = self.entries[(name, line)] = Entry(name, line)
+
+        entry.active += 1
+        self.stack.append([entry, perf_counter(), 0.0])
+
+    def exit(self) -> None:
+        entry, start, nested = self.stack.pop()
+        elapsed: float = perf_counter() - start
+
+        entry.calls += 1
+        entry.selfTime += elapsed - nested
+        entry.active -= 1
+
+        if entry.active == 0:
+            entry.totalTime += elapsed
+
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    def sortedEntries(self) -> List[Entry]:
+        return sorted(self.entries.values(), key=lambda entry: entry.selfTime, reverse=True)
+
+    def printReport(self) -> None:
+        print(f'\nProfile: {self.elapsed * 1000:.3f} ms, sorted by self time\n')
+        print(f'{"calls":>10} {"self ms":>12} {"total ms":>12} {"self %":>7}  name')
+
+        for entry in self.sortedEntries():
+            share: float = entry.selfTime / self.elapsed * 100 if self.elapsed else 0.0
+            where: str = 'native' if entry.line is None else f'line {entry.line}'
+
+            print(f'{entry.calls:>10} {entry.selfTime * 1000:>12.3f} {entry.totalTime * 1000:>12.3f} {share:>6.1f}%  {entry.name} ({where})')
+
+    def writeReport(self, path: str) -> None:
+        report: dict[str, Any] = {
+            'elapsed': self.elapsed,
+            'functions': [
+                {
+                    'name': entry.name,
+                    'line': entry.line,
+                    'native': entry.line is None,
+                    'calls': entry.calls,
+                    'self': entry.selfTime,
+                    'total': entry.totalTime,
+                }
+                for entry in self.sortedEntries()
+            ],
+        }
+
+        with open(path, 'w', encoding='UTF-8') as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,708 @@
+from Expr import Expr, Literal, Unary, Grouping, Binary, Variable, Assign, Call, Get, Set, This, Super
+from Stmt import Stmt, Expression, Var, Block, If, While, For, Function, Return, Class
+
+from Environment import Environment
+from Callable import MAX_CALL_DEPTH
+from TranspiledFunction import TranspiledFunction
+from Return import Return_
+from ClassCall import ClassCall
+from Instance import Instance
+
+from TokenType import TokenType
+from Token import Token
+
+from ErrorHandler import ErrorHandler
+from RuntimeError import RuntimeError
+
+from lib.StdLib import defineStdLib
+from language.Language import Language
+
+from sys import getrecursionlimit, setrecursionlimit
+from types import TracebackType
+from typing import Any, List, override
+from re import compile as compileRegex
+
+# Marks where a global name is read in the generated source, so a NameError can be traced back to its Wiz token
+MARKER = compileRegex('\0(\\d+)\0')
+
+SYMBOLS: dict[TokenType, str] = {
+    TokenType.PLUS: '+',
+    TokenType.MINUS: '-',
+    TokenType.STAR: '*',
+    TokenType.SLASH: '/',
+    TokenType.GREATER: '>',
+    TokenType.GREATER_EQUAL: '>=',
+    TokenType.LESS: '<',
+    TokenType.LESS_EQUAL: '<=',
+}
+
+# Returned by a block compiled into its own Python function when it finishes without a Wiz return
+NEXT = object()
+
+# Wiz calls are plain Python calls here, so the call depth is only bounded through Python's recursion limit
+FRAMES_PER_CALL: int = 2
+
+class PythonTranspiler(Expr.Visitor, Stmt.Visitor):
+    def __init__(self, errorHandler: ErrorHandler, language: Language, maxCallDepth: int = MAX_CALL_DEPTH) -> None:
+        self.errorHandler = errorHandler
+        self.language = language
+
+        self.maxCallDepth: int = maxCallDepth
+        setrecursionlimit(max(getrecursionlimit(), maxCallDepth * FRAMES_PER_CALL))
+
+        self.thisName: str = language.thisName
+        self.superName: str = language.superName
+
+        # Tokens, calls and declarations referenced by index from the generated code
+        self.constants: List[Any] = []
+        self.sourceMaps: dict[str, dict[tuple[int, int], Token]] = {}
+        self.names: int = 0
+
+        # Wiz scopes, mirroring the resolver, and the generated Python function owning each of them
+        self.scopes: List[dict[str, str]] = []
+        self.owners: List[dict[str, Any]] = []
+        self.functions: List[dict[str, Any]] = []
+
+        self.namespace: dict[str, Any] = self.createNamespace()
+
+    def interpret(self, statements: List[Stmt], isREPL: bool) -> None:
+        filename: str = f'<wiz {len(self.sourceMaps)}>'
+        source, self.sourceMaps[filename] = self.transpile(statements, isREPL)
+
+        try:
+            exec(compile(source, filename, 'exec'), self.namespace)
+
+        except RuntimeError as error:
+            self.errorHandler.runtimeError(error)
+
+        except NameError as error:
+            token: Token = self.findToken(error.__traceback__)
+
+            if token is None:
+                raise
+
+            self.errorHandler.runtimeError(RuntimeError(token, f'Undefined variable "{token.lexeme}" on variable call'))
+
+        except RecursionError as error:
+            token = self.findToken(error.__traceback__)
+
+            if token is None:
+                raise
+
+            self.errorHandler.runtimeError(RuntimeError(token, 'Maximum call depth exceeded'))
+
+    def transpile(self, statements: List[Stmt], isREPL: bool) -> tuple[str, dict[tuple[int, int], Token]]:
+        self.functions.append(self.newFunction(False, 'None'))
+
+        for statement in statements:
+            self.statement(statement)
+
+            if isREPL and isinstance(statement, Expression):
+                self.emit(f'print({self.expression(statement.expression)})')
+
+        lines: List[str] = self.functions.pop()['lines']
+        sourceMap: dict[tuple[int, int], Token] = {}
+
+        for number in range(len(lines)):
+            line: str = lines[number]
+
+            while (marker := MARKER.search(line)) is not None:
+                column: int = len(line[:marker.start()].encode('utf-8'))
+                sourceMap[(number + 1, column)] = self.constants[int(marker.group(1))]
+                line = line[:marker.start()] + line[marker.end():]
+
+            lines[number] = line
+
+        return '\n'.join(lines) + '\n', sourceMap
+
+    # Statements
+
+    @override
+    def visitExpressionStmt(self, stmt: Expression) -> None:
+        self.emit(self.expression(stmt.expression))
+
+    @override
+    def visitIfStmt(self, stmt: If) -> None:
+        self.emit(f'if {self.truthy(self.expression(stmt.condition))}:')
+        self.indented(stmt.thenBranch)
+
+        if stmt.elseBranch is not None:
+            self.emit('else:')
+            self.indented(stmt.elseBranch)
+
+    @override
+    def visitWhileStmt(self, stmt: While) -> None:
+        self.emit(f'while {self.truthy(self.expression(stmt.condition))}:')
+
+        self.functions[-1]['loops'] += 1
+        self.indented(stmt.body)
+        self.functions[-1]['loops'] -= 1
+
+    @override
+    def visitForStmt(self, stmt: For) -> None:
+        function: dict[str, Any] = self.functions[-1]
+        first: str = self.uniqueName('_first')
+        last: str = self.uniqueName('_last')
+
+        self.emit(f'{first} = {self.expression(stmt.start)}')
+        self.emit(f'{last} = {self.expression(stmt.end)}')
+        self.emit(f'if type({first}) is not float or type({last}) is not float: _bounds({self.constant(stmt.keyword)})')
+
+        self.beginScope()
+        counter: str = self.declare(stmt.name.lexeme)
+
+        self.emit(f'{counter} = {first}')
+        self.emit(f'while {counter} <= {last}:')
+
+        function['indent'] += 1
+        function['loops'] += 1
+
+        if stmt.perIteration:
+            self.defineBlockFunction(stmt.body, (stmt.name.lexeme, counter))
+
+        else:
+            self.statement(stmt.body)
+
+        function['loops'] -= 1
+
+        self.emit(f'{counter} = {counter} + 1.0 if type({counter}) is float else _counter({self.constant(stmt.name)})')
+        function['indent'] -= 1
+
+        self.endScope()
+
+    @override
+    def visitVarStmt(self, stmt: Var) -> None:
+        value: str = 'None'
+
+        if stmt.initializer is not None:
+            value = self.expression(stmt.initializer)
+
+        self.emit(f'{self.declare(stmt.name.lexeme)} = {value}')
+
+    @override
+    def visitFunctionStmt(self, stmt: Function) -> None:
+        name: str = self.declare(stmt.name.lexeme)
+        function: str = self.defineFunction(stmt, None, False)
+
+        self.emit(f'{name} = _TranspiledFunction(_K[{self.constant(stmt)}], {function}, False)')
+
+    @override
+    def visitReturnStmt(self, stmt: Return) -> None:
+        value: str = self.functions[-1]['returns']
+
+        if stmt.value is not None:
+            value = self.expression(stmt.value)
+
+        if self.functions[-1]['isFunction']:
+            self.emit(f'return {value}')
+
+        else:
+            self.emit(f'raise _Return({value})')
+
+    @override
+    def visitClassStmt(self, stmt: Class) -> None:
+        superclass: str = 'None'
+
+        if stmt.superclass is not None:
+            superclass = self.uniqueName('_super')
+            self.emit(f'{superclass} = _superclass({self.expression(stmt.superclass)}, {self.constant(stmt.superclass.name)})')
+
+        name: str = self.declare(stmt.name.lexeme)
+        self.emit(f'{name} = None')
+
+        if stmt.superclass is not None:
+            self.beginScope()
+            self.scopes[-1][self.superName] = superclass
+
+        # Each method gets its own "this" parameter, defineFunction fills this scope in
+        self.beginScope()
+
+        methods: List[str] = []
+
+        for method in stmt.methods:
+            isInitializer: bool = method.name.lexeme == self.language.initName
+            function: str = self.defineFunction(method, self.localName(self.thisName), isInitializer)
+            methods.append(f'{method.name.lexeme!r}: _TranspiledFunction(_K[{self.constant(method)}], {function}, {isInitializer})')
+
+        self.endScope()
+
+        if stmt.superclass is not None:
+            self.endScope()
+
+        self.emit(f'{name} = _ClassCall({stmt.name.lexeme!r}, {superclass}, {{{", ".join(methods)}}})')
+
+    @override
+    def visitBlockStmt(self, stmt: Block) -> None:
+        # Closures created in a loop body must capture that iteration's variables,
+        # so such blocks get a fresh Python frame on each run
+        if self.functions[-1]['loops'] > 0 and self.capturesDeclarations(stmt):
+            self.defineBlockFunction(stmt)
+            return
+
+        # Blocks declaring nothing have no scope in the resolver either
+        if stmt.size == 0:
+            for statement in stmt.statements:
+                self.statement(statement)
+
+            return
+
+        self.beginScope()
+
+        for statement in stmt.statements:
+            self.statement(statement)
+
+        self.endScope()
+
+    # Expressions
+
+    @override
+    def visitLiteralExpr(self, expr: Literal) -> str:
+        return repr(expr.value)
+
+    @override
+    def visitUnaryExpr(self, expr: Unary) -> str:
+        right: str = self.expression(expr.right)
+        value: str = self.uniqueName('_t')
+
+        match expr.operator.type:
+            case TokenType.NOT:
+                return f'(({value} := {right}) is None or {value} is False)'
+
+            case TokenType.MINUS:
+                return f'(-{value} if type({value} := {right}) is float else _operand({self.constant(expr.operator)}))'
+
+    @override
+    def visitGroupingExpr(self, expr: Grouping) -> str:
+        return self.expression(expr.expression)
+
+    @override
+    def visitBinaryExpr(self, expr: Binary) -> str:
+        left: str = self.expression(expr.left)
+        right: str = self.expression(expr.right)
+
+        match expr.operator.type:
+            case TokenType.OR:
+                value: str = self.uniqueName('_t')
+                return f'({value} if {self.truthy(left, value)} else {right})'
+
+            case TokenType.AND:
+                value: str = self.uniqueName('_t')
+                return f'({right} if {self.truthy(left, value)} else {value})'
+
+            case TokenType.BANG_EQUAL: return f'({left} != {right})'
+            case TokenType.EQUAL_EQUAL: return f'({left} == {right})'
+
+        a: str = self.uniqueName('_a')
+        b: str = self.uniqueName('_b')
+        operator: int = self.constant(expr.operator)
+
+        if expr.operands is not None:
+            return self.arithmetic(expr, left, right, a, b, operator)
+
+        # Both operands are always evaluated before their types are checked, like in the interpreter
+        if expr.operator.type == TokenType.PLUS:
+            return (f'(({a} + {b}) if type({a} := {left}) is type({b} := {right}) and (type({a}) is float or type({a}) is str) '
+                    f'else _plus({operator}))')
+
+        return f'(({a} {SYMBOLS[expr.operator.type]} {b}) if type({a} := {left}) is type({b} := {right}) is float else _operands({operator}))'
+
+    def arithmetic(self, expr: Binary, left: str, right: str, a: str, b: str, operator: int) -> str:
+        # Operands inference is sure of are not checked, the others fall back to what the generic path does
+        symbol: str = SYMBOLS[expr.operator.type]
+        operands: str = expr.operands.__name__
+
+        if not expr.guardLeft and not expr.guardRight:
+            return f'({left} {symbol} {right})'
+
+        if not expr.guardRight and isinstance(expr.right, Literal):
+            fallback: str = f'_add({a}, {right}, {operator})' if expr.operator.type == TokenType.PLUS else f'_operands({operator})'
+            return f'(({a} {symbol} {right}) if type({a} := {left}) is {operands} else {fallback})'
+
+        fallback: str = f'_add({a}, {b}, {operator})' if expr.operator.type == TokenType.PLUS else f'_operands({operator})'
+        return f'(({a} {symbol} {b}) if type({a} := {left}) is type({b} := {right}) is {operands} else {fallback})'
+
+    @override
+    def visitCallExpr(self, expr: Call) -> str:
+        callee: str = self.expression(expr.callee)
+        arguments: List[str] = [self.expression(argument) for argument in expr.arguments]
+
+        # Marked like global names, so running out of Python frames can be traced back to the call
+        return f'\0{self.constant(expr.paren)}\0_call({callee}, {self.constant(expr)})({", ".join(arguments)})'
+
+    @override
+    def visitGetExpr(self, expr: Get) -> str:
+        return f'_get({self.expression(expr.object)}, {self.constant(expr)})'
+
+    @override
+    def visitSetExpr(self, expr: Set) -> str:
+        return f'_set(_instance({self.expression(expr.object)}, {self.constant(expr.name)}), {self.constant(expr)}, {self.expression(expr.value)})'
+
+    @override
+    def visitSuperExpr(self, expr: Super) -> str:
+        distance: int = expr.depth
+
+        superclass: str = self.scopes[len(self.scopes) - 1 - distance][self.superName]
+        instance: str = self.scopes[len(self.scopes) - distance][self.thisName]
+
+        return f'_super({superclass}, {instance}, {self.constant(expr.method)})'
+
+    @override
+    def visitThisExpr(self, expr: This) -> str:
+        return self.variable(expr.keyword, expr.depth)
+
+    @override
+    def visitVariableExpr(self, expr: Variable) -> str:
+        return self.variable(expr.name, expr.depth)
+
+    @override
+    def visitAssignExpr(self, expr: Assign) -> str:
+        value: str = self.expression(expr.value)
+        distance: int = expr.depth
+
+        if distance is not None:
+            return f'({self.assignTarget(distance, expr.name.lexeme)} := {value})'
+
+        # Globals must already exist, checked after the value is evaluated like in the interpreter
+        name: str = f'v_{expr.name.lexeme}'
+        temporary: str = self.uniqueName('_t')
+
+        if self.functions[-1]['isFunction']:
+            self.functions[-1]['globals'].add(name)
+
+        return (f'(({name} := {temporary}) if ({temporary} := {value}) is {temporary} and {name!r} in _G '
+                f'else _undefined({self.constant(expr.name)}))')
+
+    # Helpers
+
+    def expression(self, expr: Expr) -> str:
+        return expr.accept(self)
+
+    def statement(self, stmt: Stmt) -> None:
+        stmt.accept(self)
+
+    def emit(self, line: str) -> None:
+        function: dict[str, Any] = self.functions[-1]
+        function['lines'].append('    ' * function['indent'] + line)
+
+    def indented(self, stmt: Stmt) -> None:
+        function: dict[str, Any] = self.functions[-1]
+        start: int = len(function['lines'])
+
+        function['indent'] += 1
+        self.statement(stmt)
+
+        if len(function['lines']) == start:
+            self.emit('pass')
+
+        function['indent'] -= 1
+
+    def truthy(self, expression: str, value: str = None) -> str:
+        if value is None:
+            value = self.uniqueName('_t')
+
+        return f'(({value} := {expression}) is not None and {value} is not False)'
+
+    def variable(self, name: Token, distance: int) -> str:
+        if distance is None:
+            return f'\0{self.constant(name)}\0v_{name.lexeme}'
+
+        return self.scopes[len(self.scopes) - 1 - distance][name.lexeme]
+
+    def assignTarget(self, distance: int, lexeme: str) -> str:
+        index: int = len(self.scopes) - 1 - distance
+        name: str = self.scopes[index][lexeme]
+        owner: dict[str, Any] = self.owners[index]
+        function: dict[str, Any] = self.functions[-1]
+
+        if owner is not function:
+            function['nonlocals' if owner['isFunction'] else 'globals'].add(name)
+
+        return name
+
+    def defineFunction(self, declaration: Function, this: str, isInitializer: bool) -> str:
+        name: str = self.uniqueName(f'_f_{declaration.name.lexeme}')
+        function: dict[str, Any] = self.newFunction(True, this if isInitializer else 'None')
+        parameters: List[str] = []
+
+        self.functions.append(function)
+
+        if this is not None:
+            self.scopes[-1] = {self.thisName: this}
+            self.owners[-1] = function
+            parameters.append(this)
+
+        self.beginScope()
+
+        for param in declaration.params:
+            parameters.append(self.declare(param.lexeme))
+
+        for statement in declaration.body:
+            self.statement(statement)
+
+        if isInitializer:
+            self.emit(f'return {this}')
+
+        self.endScope()
+        self.functions.pop()
+
+        self.emit(f'def {name}({", ".join(parameters)}):')
+        self.emitBody(function)
+
+        return name
+
+    def defineBlockFunction(self, block: Block, counter: tuple[str, str] = None) -> None:
+        enclosing: dict[str, Any] = self.functions[-1]
+        name: str = self.uniqueName('_block')
+        function: dict[str, Any] = self.newFunction(True, enclosing['returns'])
+
+        self.functions.append(function)
+
+        # The body of a loop whose variable can be captured works on a copy of it, written back for the loop to step
+        if counter is not None:
+            lexeme, variable = counter
+            copy: str = self.localName(lexeme)
+
+            self.scopes[-1][lexeme] = copy
+            self.owners[-1] = function
+            self.emit(f'{copy} = {variable}')
+
+        # A loop body declaring nothing has no scope in the resolver
+        if block.size != 0:
+            self.beginScope()
+
+        for statement in block.statements:
+            self.statement(statement)
+
+        if block.size != 0:
+            self.endScope()
+
+        if counter is not None:
+            self.scopes[-1][lexeme] = variable
+            self.owners[-1] = enclosing
+            function['nonlocals' if enclosing['isFunction'] else 'globals'].add(variable)
+            self.emit(f'{variable} = {copy}')
+
+        self.emit('return _NEXT')
+
+        self.functions.pop()
+
+        self.emit(f'def {name}():')
+        self.emitBody(function)
+
+        result: str = self.uniqueName('_t')
+        self.emit(f'if ({result} := {name}()) is not _NEXT:')
+
+        if enclosing['isFunction']:
+            self.emit(f'    return {result}')
+
+        else:
+            self.emit(f'    raise _Return({result})')
+
+    def emitBody(self, function: dict[str, Any]) -> None:
+        lines: List[str] = []
+
+        if function['globals']:
+            lines.append(f'global {", ".join(sorted(function["globals"]))}')
+
+        if function['nonlocals']:
+            lines.append(f'nonlocal {", ".join(sorted(function["nonlocals"]))}')
+
+        lines.extend(function['lines'] or ['pass'])
+
+        for line in lines:
+            self.emit('    ' + line)
+
+    def newFunction(self, isFunction: bool, returns: str) -> dict[str, Any]:
+        return {
+            'isFunction': isFunction,
+            'returns': returns,
+            'lines': [],
+            'indent': 0,
+            'loops': 0,
+            'globals': set(),
+            'nonlocals': set(),
+        }
+
+    def capturesDeclarations(self, block: Block) -> bool:
+        declares: bool = any(isinstance(statement, (Var, Function, Class)) for statement in block.statements)
+        return declares and self.containsFunction(block.statements)
+
+    def containsFunction(self, statements: List[Stmt]) -> bool:
+        for statement in statements:
+            match statement:
+                case Function() | Class(): return True
+                case Block() if self.containsFunction(statement.statements): return True
+                case While() if self.containsFunction([statement.body]): return True
+                case For() if self.containsFunction([statement.body]): return True
+                case If() if self.containsFunction([statement.thenBranch]): return True
+                case If() if statement.elseBranch is not None and self.containsFunction([statement.elseBranch]): return True
+
+        return False
+
+    def beginScope(self) -> None:
+        self.scopes.append({})
+        self.owners.append(self.functions[-1])
+
+    def endScope(self) -> None:
+        self.scopes.pop()
+        self.owners.pop()
+
+    def declare(self, lexeme: str) -> str:
+        if self.scopes == []:
+            return f'v_{lexeme}'
+
+        name: str = self.localName(lexeme)
+        self.scopes[-1][lexeme] = name
+
+        return name
+
+    def uniqueName(self, prefix: str) -> str:
+        self.names += 1
+        return f'{prefix}_{self.names}'
+
+    def localName(self, lexeme: str) -> str:
+        # Globals keep their source name after v_, the number first keeps locals from matching any of them
+        self.names += 1
+        return f'_l{self.names}_{lexeme}'
+
+    def constant(self, value: Any) -> int:
+        self.constants.append(value)
+        return len(self.constants) - 1
+
+    def findToken(self, traceback: TracebackType) -> Token:
+        token: Token = None
+
+        while traceback is not None:
+            code = traceback.tb_frame.f_code
+            sourceMap: dict[tuple[int, int], Token] = self.sourceMaps.get(code.co_filename)
+
+            if sourceMap is not None:
+                line, _, column, _ = list(code.co_positions())[traceback.tb_lasti // 2]
+                token = sourceMap.get((line, column), token)
+
+            traceback = traceback.tb_next
+
+        return token
+
+    def createNamespace(self) -> dict[str, Any]:
+        constants: List[Any] = self.constants
+        interpreter: PythonTranspiler = self
+
+        def call(callee: Any, index: int) -> Any:
+            expr: Call = constants[index]
+
+            count: int = len(expr.arguments)
+
+            try:
+                if not callee.minArity <= count <= callee.maxArity:
+                    raise RuntimeError(expr.paren, callee.arityMessage(count))
+
+            except AttributeError:
+                raise RuntimeError(expr.paren, 'Can only call functions and classes') from None
+
+            if type(callee) is ClassCall:
+                return lambda *arguments: callee.call(interpreter, list(arguments))
+
+            # Functions and natives both take their arguments positionally
+            return callee.function
+
+        def get(object: Any, index: int) -> Any:
+            if isinstance(object, Instance):
+                expr: Get = constants[index]
+
+                if object.shape is expr.shape:
+                    if expr.index is not None:
+                        return object.values[expr.index]
+
+                    return object.getMethod(expr.name)
+
+                return object.getProperty(expr)
+
+            raise RuntimeError(constants[index].name, 'Only instances have properties')
+
+        def instance(object: Any, index: int) -> Instance:
+            if not isinstance(object, Instance):
+                raise RuntimeError(constants[index], 'Only instances have fields')
+
+            return object
+
+        def set(object: Instance, index: int, value: Any) -> Any:
+            expr: Set = constants[index]
+
+            if object.shape is expr.shape and expr.transition is None:
+                object.values[expr.index] = value
+
+            else:
+                object.setProperty(expr, value)
+
+            return value
+
+        def super_(superclass: ClassCall, object: Instance, index: int) -> TranspiledFunction:
+            method: Token = constants[index]
+            function: TranspiledFunction = superclass.findMethod(method.lexeme)
+
+            if function is None:
+                raise RuntimeError(method, f'Undefined property {method.lexeme}')
+
+            return function.bind(object)
+
+        def superclass(value: Any, index: int) -> ClassCall:
+            if not isinstance(value, ClassCall):
+                raise RuntimeError(constants[index], 'Superclass must be a class')
+
+            return value
+
+        def undefined(index: int) -> None:
+            raise RuntimeError(constants[index], f'Undefined variable "{constants[index].lexeme}" on variable assignment')
+
+        def operand(index: int) -> None:
+            raise RuntimeError(constants[index], 'Operand must be a number')
+
+        def operands(index: int) -> None:
+            raise RuntimeError(constants[index], 'Operands must be numbers')
+
+        def plus(index: int) -> None:
+            raise RuntimeError(constants[index], 'Operands must be two numbers or two strings')
+
+        def add(a: Any, b: Any, index: int) -> Any:
+            if type(a) is type(b) and (type(a) is float or type(a) is str):
+                return a + b
+
+            plus(index)
+
+        def bounds(index: int) -> None:
+            raise RuntimeError(constants[index], 'Loop bounds must be numbers')
+
+        def counter(index: int) -> None:
+            raise RuntimeError(constants[index], 'Loop variable must be a number')
+
+        namespace: dict[str, Any] = {
+            '_K': constants,
+            '_NEXT': NEXT,
+            '_Return': Return_,
+            '_TranspiledFunction': TranspiledFunction,
+            '_ClassCall': ClassCall,
+            '_call': call,
+            '_get': get,
+            '_instance': instance,
+            '_set': set,
+            '_super': super_,
+            '_superclass': superclass,
+            '_undefined': undefined,
+            '_operand': operand,
+            '_operands': operands,
+            '_plus': plus,
+            '_add': add,
+            '_bounds': bounds,
+            '_counter': counter,
+        }
+
+        namespace['_G'] = namespace
+
+        stdLib: Environment = Environment()
+        defineStdLib(stdLib, self.language)
+
+        for name, value in stdLib.values.items():
+            namespace[f'v_{name}'] = value
+
+        return namespace
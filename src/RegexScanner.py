@@ -0,0 +1,161 @@
+from Token import Token
+from TokenType import TokenType
+from ErrorHandler import ErrorHandler
+from ErrorType import ErrorType
+from language.KeywordTrie import KeywordTrie
+from typing import Iterator, List
+import re
+
+# Bulk tokenizer producing exactly the tokens of Scanner, including its line and column bookkeeping,
+# by matching one lexeme at a time with a single precompiled pattern instead of one character at a time
+
+LEXEMES: str = r'''
+    [ \t\r]*
+    (?:
+        (?P<KEYWORD>{keywords})
+      | (?P<IDENTIFIER>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<NEWLINE>\n)
+      | (?P<OPERATOR>[!=<>]=?|[(),.\-+*/])
+      | (?P<NUMBER>[0-9]+(?:\.[0-9]+)?)
+      | (?P<STRING>"[^"]*"|'[^']*')
+      | (?P<COMMENT>[\#@][^\n]*)
+      | (?P<UNTERMINATED>["'].*)
+      | (?P<INVALID>.)
+      | (?P<END>\Z)
+    )
+'''
+
+WORD_END: str = '(?![A-Za-z0-9_])'
+
+OPERATORS: dict[str, TokenType] = {
+    '(': TokenType.LEFT_PAREN,
+    ')': TokenType.RIGHT_PAREN,
+    ',': TokenType.COMMA,
+    '.': TokenType.DOT,
+    '-': TokenType.MINUS,
+    '+': TokenType.PLUS,
+    '*': TokenType.STAR,
+    '/': TokenType.SLASH,
+    '!': TokenType.BANG,
+    '!=': TokenType.BANG_EQUAL,
+    '=': TokenType.EQUAL,
+    '==': TokenType.EQUAL_EQUAL,
+    '<': TokenType.LESS,
+    '<=': TokenType.LESS_EQUAL,
+    '>': TokenType.GREATER,
+    '>=': TokenType.GREATER_EQUAL,
+}
+
+# One pattern per language, since multi-word keywords are part of it
+patterns: dict[KeywordTrie, tuple[re.Pattern, dict[str, TokenType]]] = {}
+
+class RegexScanner:
+    def __init__(self, source: str, keywords: KeywordTrie, errorHandler: ErrorHandler) -> None:
+        self.keywords: KeywordTrie = keywords
+        self.errorHandler = errorHandler
+        errorHandler.lines = source.splitlines()
+        errorHandler.lines.append('')
+
+        self.source: str = source
+        self.tokens: List[Token] = []
+
+    def scanTokens(self) -> List[Token]:
+        self.tokens.extend(self.streamTokens())
+        return self.tokens
+
+    def streamTokens(self) -> Iterator[Token]:
+        pattern, phrases = self.findPattern(self.keywords)
+        keywords: dict[str, KeywordTrie] = self.keywords.children
+        source: str = self.source
+
+        previous: int = 0
+        line: int = 1
+        column: int = 1
+
+        for lexeme in pattern.finditer(source):
+            kind: str = lexeme.lastgroup
+            text: str = lexeme[kind]
+            end: int = lexeme.end()
+
+            # Blanks before the lexeme
+            column += end - previous - len(text)
+            previous = end
+
+            if kind == 'IDENTIFIER':
+                node: KeywordTrie = keywords.get(text)
+
+                if node is None:
+                    yield Token(TokenType.IDENTIFIER, text, None, line, column + 1)
+
+                elif node.type is not None:
+                    yield Token(node.type, text, None, line, column + 1)
+
+                else:
+                    errorToken = Token(TokenType.IDENTIFIER, text, None, line, column + 1)
+                    self.errorHandler.syntaxError(errorToken, ErrorType.INCOMPLETE_KEYWORD, f'Could be {node.keywords}')
+
+                column += len(text)
+
+            elif kind == 'OPERATOR':
+                yield Token(OPERATORS[text], text, None, line, column + 1)
+                # Scanner only counts the first character of two-character operators
+                column += 1
+
+            elif kind == 'NEWLINE':
+                yield Token(TokenType.NEWLINE, 'new line', None, line, column + 1)
+                line += 1
+                column = 1
+
+            elif kind == 'NUMBER':
+                yield Token(TokenType.NUMBER, text, float(text), line, column + 1)
+                column += len(text)
+
+            elif kind == 'KEYWORD':
+                yield Token(phrases[text], text, None, line, column + 1)
+                column += len(text)
+
+            elif kind == 'STRING':
+                # Newlines inside strings move to the next line but do not reset the column
+                line += text.count('\n')
+                yield Token(TokenType.STRING, text, text[1:-1], line, column + 1)
+                column += len(text)
+
+            elif kind == 'COMMENT':
+                column += len(text)
+
+            elif kind == 'UNTERMINATED':
+                line += text.count('\n')
+                errorToken = Token(TokenType.QUOTES, text[0], None, line, column + 1)
+                self.errorHandler.syntaxError(errorToken, ErrorType.UNTERMINATED_STRING, f'Expected another {text[0]} at end to close text value')
+                column += len(text)
+
+            elif kind == 'INVALID':
+                errorToken = Token(TokenType.IDENTIFIER, text, None, line, column + 1)
+                self.errorHandler.syntaxError(errorToken, ErrorType.UNEXPECTED_CHARACTER, 'Invalid character')
+                column += 1
+
+        yield Token(TokenType.EOF, '', None, line, column + 1)
+
+    def findPattern(self, keywords: KeywordTrie) -> tuple[re.Pattern, dict[str, TokenType]]:
+        if keywords not in patterns:
+            phrases: dict[str, TokenType] = {}
+            self.collectPhrases(keywords, [], phrases)
+
+            # Longest first, so the longest complete keyword wins like in Scanner.identifier
+            alternatives: List[str] = [
+                r'\ ?'.join(re.escape(word) + WORD_END for word in phrase.split())
+                for phrase in sorted(phrases, key=len, reverse=True)
+            ]
+
+            lexemes: str = LEXEMES.replace('{keywords}', '|'.join(alternatives) or '(?!)')
+            patterns[keywords] = (re.compile(lexemes, re.VERBOSE | re.DOTALL), phrases)
+
+        return patterns[keywords]
+
+    def collectPhrases(self, node: KeywordTrie, words: List[str], phrases: dict[str, TokenType]) -> None:
+        # Single words are found through the trie, only keywords of several words go in the pattern
+        if node.type is not None and len(words) > 1:
+            phrases[' '.join(words)] = node.type
+
+        for word, child in node.children.items():
+            self.collectPhrases(child, words + [word], phrases)
@@ -1,10 +1,8 @@
 from Expr import Expr, Variable, Assign, Binary, Call, Grouping, Literal, Unary, This, Set, Get, Super
-from Stmt import Stmt, Block, Var, Function, Expression, If, Return, While, Class
-from Interpreter import Interpreter
+from Stmt import Stmt, Block, Var, Function, Expression, If, Return, While, For, Class
 from Token import Token
 from ErrorHandler import ErrorHandler
 from language.Language import Language
-from TokenType import TokenType
 from typing import override, List
 from enum import Enum
 
@@ -20,11 +18,13 @@ class ClassType(Enum):
     SUBCLASS = 3
 
 class Resolver(Expr.Visitor, Stmt.Visitor):
-    def __init__(self, interpreter: Interpreter, errorHandler: ErrorHandler, language: Language) -> None:
-        self.interpreter: Interpreter = interpreter
+    def __init__(self, errorHandler: ErrorHandler, language: Language) -> None:
         self.scopes: List[dict[str, bool]] = []
+        self.slots: List[dict[str, int]] = []
         self.currentFunction: FunctionType = FunctionType.NONE
         self.currentClass: ClassType = ClassType.NONE
+        # Functions and methods resolved so far, tells whether a loop body declares any
+        self.functionCount: int = 0
 
         self.errorHandler: ErrorHandler = errorHandler
         self.language: Language = language
@@ -33,13 +33,19 @@ class Resolver(Expr.Visitor, Stmt.Visitor):
 
     @override
     def visitBlockStmt(self, stmt: Block) -> None:
+        # A block declaring nothing gets no scope of its own, size 0 tells the backends to run it in the enclosing one
+        if not self.declaresNames(stmt.statements):
+            self.resolveStatements(stmt.statements)
+            stmt.size = 0
+            return
+
         self.beginScope()
         self.resolveStatements(stmt.statements)
-        self.endScope()
+        stmt.size = self.endScope()
 
     @override
     def visitVarStmt(self, stmt: Var) -> None:
-        self.declare(stmt.name)
+        stmt.slot = self.declare(stmt.name)
 
         if stmt.initializer is not None:
             self.resolve(stmt.initializer)
@@ -48,7 +54,7 @@ class Resolver(Expr.Visitor, Stmt.Visitor):
 
     @override
     def visitFunctionStmt(self, stmt: Function) -> None:
-        self.declare(stmt.name)
+        stmt.slot = self.declare(stmt.name)
         self.define(stmt.name)
         self.resolveFunction(stmt, FunctionType.FUNCTION)
 
@@ -57,7 +63,7 @@ class Resolver(Expr.Visitor, Stmt.Visitor):
         enclosingClass: ClassType = self.currentClass
         self.currentClass = ClassType.CLASS
 
-        self.declare(stmt.name)
+        stmt.slot = self.declare(stmt.name)
         self.define(stmt.name)
 
         if stmt.superclass is not None and stmt.name.lexeme == stmt.superclass.name.lexeme:
@@ -69,16 +75,18 @@ class Resolver(Expr.Visitor, Stmt.Visitor):
 
         if stmt.superclass is not None:
             self.beginScope()
-            self.scopes[-1][self.retriveKeyword(TokenType.SUPER)] = True
+            self.scopes[-1][self.language.superName] = True
+            self.addSlot(self.language.superName)
 
         self.beginScope()
         
-        self.scopes[-1][self.retriveKeyword(TokenType.THIS)] = True
+        self.scopes[-1][self.language.thisName] = True
+        self.addSlot(self.language.thisName)
 
         for method in stmt.methods:
             declaration = FunctionType.METHOD
             
-            if method.name.lexeme == 'init':
+            if method.name.lexeme == self.language.initName:
                 declaration = FunctionType.INITIALIZER
             
             self.resolveFunction(method, declaration)
@@ -110,11 +118,33 @@ class Resolver(Expr.Visitor, Stmt.Visitor):
             
             self.resolve(stmt.value)
 
+            # A call whose result is returned as is can reuse the caller's frame
+            if isinstance(stmt.value, Call) and self.currentFunction in (FunctionType.FUNCTION, FunctionType.METHOD):
+                stmt.value.tail = True
+
     @override
     def visitWhileStmt(self, stmt: While) -> None:
         self.resolve(stmt.condition)
         self.resolve(stmt.body)
 
+    @override
+    def visitForStmt(self, stmt: For) -> None:
+        # Bounds are evaluated once, before the loop variable exists
+        self.resolve(stmt.start)
+        self.resolve(stmt.end)
+
+        # The loop variable is alone in its scope, at slot 0
+        self.beginScope()
+        self.declare(stmt.name)
+        self.define(stmt.name)
+
+        # Functions declared in the body can capture the loop variable, so each iteration then gets its own
+        functionCount: int = self.functionCount
+        self.resolve(stmt.body)
+        stmt.perIteration = self.functionCount > functionCount
+
+        self.endScope()
+
     # Expressions
 
     @override
@@ -189,15 +219,18 @@ class Resolver(Expr.Visitor, Stmt.Visitor):
         for statement in statements:
             self.resolve(statement)
 
-    def resolveLocal(self, expr: Expr, name: Token) -> None:
+    def resolveLocal(self, expr: Variable | Assign | This | Super, name: Token) -> None:
+        # Unresolved names keep depth None and are looked up as globals
         for i in range(len(self.scopes) - 1, -1, -1):
             if name.lexeme in self.scopes[i]:
-                self.interpreter.resolve(expr, len(self.scopes) - 1 - i)
+                expr.depth = len(self.scopes) - 1 - i
+                expr.slot = self.slots[i][name.lexeme]
                 return
 
     def resolveFunction(self, function: Function, type: FunctionType) -> None:
         enclosingFunction: FunctionType = self.currentFunction
         self.currentFunction = type
+        self.functionCount += 1
         
         self.beginScope()
 
@@ -207,20 +240,25 @@ class Resolver(Expr.Visitor, Stmt.Visitor):
         
         self.resolveStatements(function.body)
 
-        self.endScope()
+        function.size = self.endScope()
         
         self.currentFunction = enclosingFunction
 
+    def declaresNames(self, statements: List[Stmt]) -> bool:
+        return any(isinstance(statement, (Var, Function, Class)) for statement in statements)
+
     def beginScope(self) -> None:
         scope: dict[str, bool] = {}
         self.scopes.append(scope)
+        self.slots.append({})
 
-    def endScope(self) -> None:
+    def endScope(self) -> int:
         self.scopes.pop()
+        return len(self.slots.pop())
 
-    def declare(self, name: Token) -> None:
+    def declare(self, name: Token) -> int:
         if self.scopes == []:
-            return
+            return None
 
         scope: dict[str, bool] = self.scopes[-1]
 
@@ -229,11 +267,16 @@ class Resolver(Expr.Visitor, Stmt.Visitor):
         
         scope[name.lexeme] = False
 
+        return self.addSlot(name.lexeme)
+
+    def addSlot(self, name: str) -> int:
+        slots: dict[str, int] = self.slots[-1]
+        slots[name] = len(slots)
+
+        return slots[name]
+
     def define(self, name: Token) -> None:
         if self.scopes == []:
             return
 
         self.scopes[-1][name.lexeme] = True
-
-    def retriveKeyword(self, type: TokenType) -> str:
-        return next((k for k, v in self.language.keywords.items() if v == type), None)
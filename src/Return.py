@@ -3,3 +3,9 @@ from typing import Any
 class Return_(RuntimeError):
     def __init__(self, value: Any) -> None:
         self.value = value
+
+# Completion of a statement that ran a Wiz return, the returned value is left on the backend instead of raised
+RETURNED = object()
+
+# Returned in place of the value of a call in tail position, the call running the caller's body then runs the callee itself
+TAIL_CALL = object()
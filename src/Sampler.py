@@ -0,0 +1,185 @@
+from Stmt import Stmt, Block, Function
+from FunctionCall import FunctionCall
+from NativeFunction import NativeFunction
+from Interpreter import Interpreter
+from Labels import Labels
+from Lines import lineOf
+from threading import Thread, Event, get_ident
+from sys import _current_frames
+from types import CodeType, FrameType
+from collections import Counter
+from typing import Any, List
+
+# Milliseconds between two samples when no interval is given
+SAMPLE_INTERVAL: float = 5.0
+
+# Python frames of the interpreter methods running statements, with the local holding the statement
+STATEMENT_LOCALS: dict[CodeType, str] = {
+    Interpreter.executeBlock.__code__: 'statement',
+    Interpreter.visitBlockStmt.__code__: 'statement',
+    Interpreter.execute.__code__: 'stmt',
+}
+
+# Every Wiz call runs in a Python frame of FunctionCall.call, tail calls included
+CALL_CODE: CodeType = FunctionCall.call.__code__
+
+class Sampler:
+    # Periodically records the Wiz call stack of a program running on the tree-walking interpreter.
+    # While it runs, the interpreter's call hook keeps a shadow stack of the calls in progress, touched only when one
+    # starts or ends. A background thread copies it at every interval and reads the statement each call is running
+    # from the interpreter's Python frames, so statements cost nothing extra
+    reportExtension: str = '.folded'
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval: float = interval
+        # Declaration of each Wiz function in progress, or the native itself, outermost first
+        self.stack: List[Function | NativeFunction] = []
+        self.samples: Counter[tuple] = Counter()
+        self.labels: Labels = Labels()
+        self.lines: dict[Stmt, int] = {}
+
+    def run(self, interpreter: Interpreter, statements: List[Stmt], isREPL: bool) -> None:
+        self.labels.label(statements)
+        restore = self.instrument(interpreter)
+
+        stop: Event = Event()
+        # The sampling thread only runs when the interpreter hands over the GIL, at most every switch interval (5 ms by default)
+        thread: Thread = Thread(target=self.sample, args=(stop, get_ident()), daemon=True)
+        thread.start()
+
+        try:
+            interpreter.interpret(statements, isREPL)
+
+        finally:
+            stop.set()
+            thread.join()
+            restore()
+
+    def sample(self, stop: Event, threadId: int) -> None:
+        while not stop.wait(self.interval / 1000):
+            calls: List[Function | NativeFunction] = self.stack[:]
+            frame: FrameType = _current_frames().get(threadId)
+
+            if frame is None:
+                continue
+
+            # Frames are only resolved to names and lines once the run ends, a sample just copies them
+            statements: List[Stmt] = self.statementsOf(frame)
+            frames: List[tuple] = [(None, statements[0])]
+            index: int = 1
+
+            for callee in calls:
+                # Natives run no statements, and have no call frame of their own
+                if type(callee) is not Function:
+                    frames.append((callee, None))
+                    continue
+
+                frames.append((callee, statements[index] if index < len(statements) else None))
+                index += 1
+
+            self.samples[tuple(frames)] += 1
+
+    def statementsOf(self, frame: FrameType) -> List[Stmt]:
+        # Innermost statement running in each Wiz call of the Python stack, the main program first
+        statements: List[Stmt] = []
+        statement: Stmt = None
+
+        while frame is not None:
+            code: CodeType = frame.f_code
+
+            if code is CALL_CODE:
+                statements.append(statement)
+                statement = None
+
+            elif statement is None and code in STATEMENT_LOCALS:
+                found: Stmt = frame.f_locals.get(STATEMENT_LOCALS[code])
+
+                # A block has no line, the statement it runs is looked for further out only until it starts one
+                if type(found) is not Block:
+                    statement = found
+
+            frame = frame.f_back
+
+        statements.append(statement)
+        statements.reverse()
+
+        return statements
+
+    def instrument(self, interpreter: Interpreter) -> Any:
+        interpreter.callHook = self
+
+        natives: List[NativeFunction] = [value for value in interpreter.globals.values.values() if isinstance(value, NativeFunction)]
+
+        for native in natives:
+            native.function = self.wrapNative(native)
+
+        def restore() -> None:
+            interpreter.callHook = None
+
+            for native in natives:
+                del native.function
+
+        return restore
+
+    def enterCall(self, function: FunctionCall) -> None:
+        self.stack.append(function.declaration)
+
+    def exitCall(self) -> None:
+        self.stack.pop()
+
+    def wrapNative(self, native: NativeFunction) -> Any:
+        stack: List[Function | NativeFunction] = self.stack
+        function = native.function
+
+        def sampledNative(*arguments: Any) -> Any:
+            stack.append(native)
+
+            try:
+                return function(*arguments)
+
+            finally:
+                stack.pop()
+
+        return sampledNative
+
+    def lineOf(self, statement: Stmt) -> int:
+        line: int = self.lines.get(statement)
+
+        if line is None and statement not in self.lines:
+            line = self.lines[statement] = lineOf(statement)
+
+        return line
+
+    def nameOf(self, callee: Function | NativeFunction) -> str:
+        if callee is None:
+            return '<main>'
+
+        if type(callee) is Function:
+            return self.labels.nameOf(callee)
+
+        return callee.name
+
+    def collapsedStacks(self) -> dict[str, int]:
+        # One line per distinct stack, outermost frame first, in the format flame graph tools read
+        stacks: Counter[str] = Counter()
+
+        for frames, count in self.samples.items():
+            names: List[str] = []
+
+            for callee, statement in frames:
+                name: str = self.nameOf(callee)
+                line: int = None if statement is None else self.lineOf(statement)
+                names.append(name if line is None else f'{name}:{line}')
+
+            stacks[';'.join(names)] += count
+
+        return stacks
+
+    def printReport(self) -> None:
+        total: int = self.samples.total()
+        print(f'\nSampled {total} stacks every {self.interval:g} ms')
+
+    def writeReport(self, path: str) -> None:
+        with open(path, 'w', encoding='UTF-8') as file:
+            for stack, count in sorted(self.collapsedStacks().items()):
+                file.write(f'{stack} {count}\n')
@@ -2,11 +2,12 @@ from Token import Token
 from TokenType import TokenType
 from ErrorHandler import ErrorHandler
 from ErrorType import ErrorType
-from typing import List, Any
+from language.KeywordTrie import KeywordTrie
+from typing import Iterator, List, Any
 
 class Scanner:
-    def __init__(self, source: str, keywords: dict[str, TokenType], errorHandler: ErrorHandler) -> None:
-        self.keywords: dict[str, TokenType] = keywords
+    def __init__(self, source: str, keywords: KeywordTrie, errorHandler: ErrorHandler) -> None:
+        self.keywords: KeywordTrie = keywords
         self.errorHandler = errorHandler
         errorHandler.lines = source.splitlines()
         errorHandler.lines.append('')
@@ -29,6 +30,17 @@ class Scanner:
         self.tokens.append(Token(TokenType.EOF, '', None, self.line, self.column + 1))
         return self.tokens
 
+    def streamTokens(self) -> Iterator[Token]:
+        while not self.isAtEnd():
+            self.start = self.current
+            self.startColumn = self.column
+            self.scanToken()
+
+            yield from self.tokens
+            self.tokens.clear()
+
+        yield Token(TokenType.EOF, '', None, self.line, self.column + 1)
+
     def scanToken(self) -> None:
         char: str = self.advance()
         match char:
@@ -139,50 +151,45 @@ class Scanner:
             self.advance()
 
         text: str = self.source[self.start:self.current]
+        first: KeywordTrie = self.keywords.children.get(text)
 
-        potentialKeywords: List[str] = []
+        if first is None:
+            self.addToken(TokenType.IDENTIFIER)
+            return
 
-        for keyword in self.keywords:
-            if keyword.split()[0] == text:
-                potentialKeywords.append(keyword)
+        # Walk the next words down the trie, keeping the longest complete keyword seen
+        node: KeywordTrie = first
+        type: TokenType = node.type
+        endCurrent: int = self.current
+        endColumn: int = self.column
 
-        if not potentialKeywords:
-            self.addToken(TokenType.IDENTIFIER)
+        while node.children:
+            if self.peek() == ' ': self.advance()
 
-        else:
-            potentialKeywords.sort(key=len, reverse=True)
-            for keyword in potentialKeywords:
-                words: List[str] = keyword.split()
+            node = node.children.get(self.nextWord())
 
-                if self.matchSequence(words[1:]):
-                    type = self.keywords[keyword]
-                    self.addToken(type)
-                    return
+            if node is None:
+                break
 
-            errorToken = Token(TokenType.IDENTIFIER, text, None, self.line, self.startColumn+1)
-            self.errorHandler.syntaxError(errorToken, ErrorType.INCOMPLETE_KEYWORD, f'Could be {potentialKeywords}')
+            if node.type is not None:
+                type = node.type
+                endCurrent = self.current
+                endColumn = self.column
 
-    def matchSequence(self, words: List[str]) -> bool:
-        saveCurrent = self.current
-        saveColumn = self.column
+        self.current = endCurrent
+        self.column = endColumn
 
-        for word in words:
-            if self.peek() == ' ': self.advance()
-            if not self.matchWord(word):
-                self.current = saveCurrent
-                self.column = saveColumn
-                return False
+        if type is not None:
+            self.addToken(type)
+            return
 
-        return True
+        errorToken = Token(TokenType.IDENTIFIER, text, None, self.line, self.startColumn+1)
+        self.errorHandler.syntaxError(errorToken, ErrorType.INCOMPLETE_KEYWORD, f'Could be {first.keywords}')
 
-    def matchWord(self, word: str) -> bool:
-        end = self.current + len(word)
-        if end > len(self.source) or self.source[self.current:end] != word:
-            return False
+    def nextWord(self) -> str:
+        start: int = self.current
 
-        if end < len(self.source) and self.isAlphaNumeric(self.source[end]):
-            return False
+        while self.isAlphaNumeric(self.peek()):
+            self.advance()
 
-        self.current = end
-        self.column += len(word)
-        return True
+        return self.source[start:self.current]
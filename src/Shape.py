@@ -0,0 +1,15 @@
+class Shape:
+    # Instances of a class that gained the same fields in the same order share a shape,
+    # which maps each field name to its index in the instance's values
+    def __init__(self, fields: dict[str, int] = None) -> None:
+        self.fields: dict[str, int] = fields if fields is not None else {}
+        self.transitions: dict[str, Shape] = {}
+
+    def addField(self, name: str) -> 'Shape':
+        shape: Shape = self.transitions.get(name)
+
+        if shape is None:
+            shape = Shape({**self.fields, name: len(self.fields)})
+            self.transitions[name] = shape
+
+        return shape
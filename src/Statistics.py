@@ -0,0 +1,187 @@
+from Stmt import Stmt
+from Expr import Expr
+from Environment import Environment
+from FunctionCall import FunctionCall
+from ClassCall import ClassCall
+from Instance import Instance
+from Return import Return_
+from collections import Counter
+from typing import Any, List
+
+class Statistics:
+    # Counts the work the tree-walking interpreter does, collected through Interpreter.startStatistics.
+    # The counting wrappers replace the counted methods only until they are restored, so other runs pay nothing for it.
+    # All counters are updated as the work happens, so they can be read while the program runs
+    def __init__(self) -> None:
+        self.environments: int = 0
+        # Lookups of resolved variables by how many scopes up they are found
+        self.localLookups: Counter[int] = Counter()
+        self.globalLookups: int = 0
+        self.returnsRaised: int = 0
+        self.binds: int = 0
+        self.instances: int = 0
+        self.fields: int = 0
+        self.largestInstance: int = 0
+        self.peakCallDepth: int = 0
+        self.nodes: int = 0
+        # Get and Set evaluations, those missing the inline cache fall back to Instance.getProperty or setProperty
+        self.propertyAccesses: int = 0
+        self.propertyCacheMisses: int = 0
+
+    @property
+    def propertyCacheHits(self) -> int:
+        return self.propertyAccesses - self.propertyCacheMisses
+
+    def instrument(self, interpreter: 'Interpreter') -> Any:
+        statistics: Statistics = self
+        environmentInit = Environment.__init__
+        instanceInit = Instance.__init__
+        returnInit = Return_.__init__
+        bind = FunctionCall.bind
+        functionCall = FunctionCall.call
+        classCall = ClassCall.call
+        setProperty = Instance.setProperty
+        instanceSet = Instance.set
+        getProperty = Instance.getProperty
+        lookUpVariable = interpreter.lookUpVariable
+        visitGetExpr = interpreter.visitGetExpr
+        visitSetExpr = interpreter.visitSetExpr
+
+        def countedEnvironmentInit(environment: Environment, enclosing: Environment = None, size: int = 0) -> None:
+            statistics.environments += 1
+            environmentInit(environment, enclosing, size)
+
+        def countedInstanceInit(instance: Instance, class_: ClassCall) -> None:
+            statistics.instances += 1
+            instanceInit(instance, class_)
+
+        def countedReturnInit(error: Return_, value: Any) -> None:
+            statistics.returnsRaised += 1
+            returnInit(error, value)
+
+        def countedBind(function: FunctionCall, instance: Instance) -> FunctionCall:
+            statistics.binds += 1
+            return bind(function, instance)
+
+        # Calls in tail position run inside the call they replace, so they never deepen the stack
+        def countedFunctionCall(function: FunctionCall, interpreter: 'Interpreter', arguments: List[Any]) -> Any:
+            statistics.peakCallDepth = max(statistics.peakCallDepth, interpreter.callDepth)
+            return functionCall(function, interpreter, arguments)
+
+        def countedClassCall(class_: ClassCall, interpreter: 'Interpreter', arguments: List[Any]) -> Any:
+            statistics.peakCallDepth = max(statistics.peakCallDepth, interpreter.callDepth)
+            return classCall(class_, interpreter, arguments)
+
+        def countedGetProperty(instance: Instance, expr: Any) -> Any:
+            if expr.shape is not instance.shape:
+                statistics.propertyCacheMisses += 1
+
+            return getProperty(instance, expr)
+
+        def countedSetProperty(instance: Instance, expr: Any, value: Any) -> None:
+            count: int = len(instance.values)
+
+            # Setting a field the node saw added before takes the cached transition, which is still a hit
+            if expr.shape is not instance.shape:
+                statistics.propertyCacheMisses += 1
+
+            setProperty(instance, expr, value)
+            statistics.countFields(instance, count)
+
+        def countedInstanceSet(instance: Instance, name: Any, value: Any) -> None:
+            count: int = len(instance.values)
+            instanceSet(instance, name, value)
+            statistics.countFields(instance, count)
+
+        def countedLookUpVariable(name: Any, depth: int, slot: int) -> Any:
+            if depth is None:
+                statistics.globalLookups += 1
+
+            else:
+                statistics.localLookups[depth] += 1
+
+            return lookUpVariable(name, depth, slot)
+
+        # Hits are resolved inline by the interpreter, so they are counted as the accesses that did not miss
+        def countedGet(expr: Any) -> Any:
+            statistics.propertyAccesses += 1
+            return visitGetExpr(expr)
+
+        def countedSet(expr: Any) -> Any:
+            statistics.propertyAccesses += 1
+            return visitSetExpr(expr)
+
+        # Every expression is run through evaluate, and every statement through the statement hook
+        def countedEvaluate(expr: Expr) -> Any:
+            statistics.nodes += 1
+            return expr.accept(interpreter)
+
+        def countedStatement(stmt: Stmt) -> object:
+            statistics.nodes += 1
+            return stmt.accept(interpreter)
+
+        # Scopes, instances, returns, binds, calls and property accesses are counted on their classes, so while counting
+        # they include those of every interpreter and backend in the process. Only one interpreter should count at a time
+        Environment.__init__ = countedEnvironmentInit
+        Instance.__init__ = countedInstanceInit
+        Return_.__init__ = countedReturnInit
+        FunctionCall.bind = countedBind
+        FunctionCall.call = countedFunctionCall
+        ClassCall.call = countedClassCall
+        Instance.getProperty = countedGetProperty
+        Instance.setProperty = countedSetProperty
+        Instance.set = countedInstanceSet
+
+        # Lookups, property evaluations and nodes are counted on this interpreter's instance only
+        interpreter.lookUpVariable = countedLookUpVariable
+        interpreter.visitGetExpr = countedGet
+        interpreter.visitSetExpr = countedSet
+        interpreter.evaluate = countedEvaluate
+        interpreter.setStatementHook(countedStatement)
+
+        def restore() -> None:
+            Environment.__init__ = environmentInit
+            Instance.__init__ = instanceInit
+            Return_.__init__ = returnInit
+            FunctionCall.bind = bind
+            FunctionCall.call = functionCall
+            ClassCall.call = classCall
+            Instance.getProperty = getProperty
+            Instance.setProperty = setProperty
+            Instance.set = instanceSet
+
+            del interpreter.lookUpVariable
+            del interpreter.visitGetExpr
+            del interpreter.visitSetExpr
+            del interpreter.evaluate
+            interpreter.setStatementHook(None)
+
+        return restore
+
+    def countFields(self, instance: Instance, count: int) -> None:
+        if len(instance.values) > count:
+            self.fields += 1
+            self.largestInstance = max(self.largestInstance, len(instance.values))
+
+    def printReport(self) -> None:
+        lookups: int = self.localLookups.total() + self.globalLookups
+        meanFields: float = self.fields / self.instances if self.instances else 0.0
+
+        print('\nRuntime statistics\n')
+        print(f'{"node evaluations":<24}{self.nodes:>12}')
+        print(f'{"environments":<24}{self.environments:>12}')
+        print(f'{"variable lookups":<24}{lookups:>12}')
+
+        for depth, count in sorted(self.localLookups.items()):
+            print(f'{f"  at depth {depth}":<24}{count:>12}')
+
+        print(f'{"  globals":<24}{self.globalLookups:>12}')
+        print(f'{"returns raised":<24}{self.returnsRaised:>12}')
+        print(f'{"method binds":<24}{self.binds:>12}')
+        print(f'{"instances":<24}{self.instances:>12}')
+        print(f'{"fields":<24}{self.fields:>12}')
+        print(f'{"  per instance":<24}{meanFields:>12.2f}')
+        print(f'{"  largest instance":<24}{self.largestInstance:>12}')
+        print(f'{"property cache hits":<24}{self.propertyCacheHits:>12}')
+        print(f'{"property cache misses":<24}{self.propertyCacheMisses:>12}')
+        print(f'{"peak call depth":<24}{self.peakCallDepth:>12}')
@@ -4,6 +4,8 @@ from Expr import Expr, Variable
 from typing import List, override
 
 class Stmt(ABC):
+    __slots__ = ()
+
     class Visitor(ABC):
         @abstractmethod
         def visitIfStmt(self, stmt: "If"):
@@ -13,6 +15,10 @@ class Stmt(ABC):
         def visitWhileStmt(self, stmt: "While"):
             pass
 
+        @abstractmethod
+        def visitForStmt(self, stmt: "For"):
+            pass
+
         @abstractmethod
         def visitVarStmt(self, stmt: "Var"):
             pass
@@ -42,6 +48,8 @@ class Stmt(ABC):
         pass
 
 class If(Stmt):
+    __slots__ = ('condition', 'thenBranch', 'elseBranch')
+
     def __init__(self, condition: Expr, thenBranch: Stmt, elseBranch: Stmt):
         self.condition: Expr = condition
         self.thenBranch: Stmt = thenBranch
@@ -52,6 +60,8 @@ class If(Stmt):
         return visitor.visitIfStmt(self)
 
 class While(Stmt):
+    __slots__ = ('condition', 'body')
+
     def __init__(self, condition: Expr, body: Stmt):
         self.condition: Expr = condition
         self.body: Stmt = body
@@ -60,26 +70,50 @@ class While(Stmt):
     def accept(self, visitor: Stmt.Visitor):
         return visitor.visitWhileStmt(self)
 
+class For(Stmt):
+    __slots__ = ('keyword', 'name', 'start', 'end', 'body', 'perIteration')
+
+    def __init__(self, keyword: Token, name: Token, start: Expr, end: Expr, body: "Block"):
+        self.keyword: Token = keyword
+        self.name: Token = name
+        self.start: Expr = start
+        self.end: Expr = end
+        self.body: "Block" = body
+        self.perIteration: bool = None
+
+    @override
+    def accept(self, visitor: Stmt.Visitor):
+        return visitor.visitForStmt(self)
+
 class Var(Stmt):
+    __slots__ = ('name', 'initializer', 'slot')
+
     def __init__(self, name: Token, initializer: Expr):
         self.name: Token = name
         self.initializer: Expr = initializer
+        self.slot: int = None
 
     @override
     def accept(self, visitor: Stmt.Visitor):
         return visitor.visitVarStmt(self)
 
 class Function(Stmt):
+    __slots__ = ('name', 'params', 'body', 'slot', 'size')
+
     def __init__(self, name: Token, params: List[Token], body: List[Stmt]):
         self.name: Token = name
         self.params: List[Token] = params
         self.body: List[Stmt] = body
+        self.slot: int = None
+        self.size: int = None
 
     @override
     def accept(self, visitor: Stmt.Visitor):
         return visitor.visitFunctionStmt(self)
 
 class Return(Stmt):
+    __slots__ = ('keyword', 'value')
+
     def __init__(self, keyword: Token, value: Expr):
         self.keyword: Token = keyword
         self.value: Expr = value
@@ -89,24 +123,32 @@ class Return(Stmt):
         return visitor.visitReturnStmt(self)
 
 class Block(Stmt):
+    __slots__ = ('statements', 'size')
+
     def __init__(self, statements: List[Stmt]):
         self.statements: List[Stmt] = statements
+        self.size: int = None
 
     @override
     def accept(self, visitor: Stmt.Visitor):
         return visitor.visitBlockStmt(self)
 
 class Class(Stmt):
+    __slots__ = ('name', 'superclass', 'methods', 'slot')
+
     def __init__(self, name: Token, superclass: Variable, methods: List["Function"]):
         self.name: Token = name
         self.superclass: Variable = superclass
         self.methods: List["Function"] = methods
+        self.slot: int = None
 
     @override
     def accept(self, visitor: Stmt.Visitor):
         return visitor.visitClassStmt(self)
 
 class Expression(Stmt):
+    __slots__ = ('expression',)
+
     def __init__(self, expression: Expr):
         self.expression: Expr = expression
 
@@ -1,10 +1,14 @@
 from TokenType import TokenType
 from typing import Any
+from sys import intern
 
 class Token:
+    __slots__ = ('type', 'lexeme', 'literal', 'line', 'column')
+
     def __init__(self, type: TokenType, lexeme: str, literal: Any, line: int, column: int) -> None:
         self.type = type
-        self.lexeme = lexeme
+        # Identifiers and keywords repeat a lot, so every occurrence shares one string
+        self.lexeme = intern(lexeme)
         self.literal = literal
         self.line = line
         self.column = column
@@ -37,6 +37,7 @@ class TokenType(Enum):
 	FALSE = auto()
 	FUNCTION = auto()
 	FOR = auto()
+	FROM = auto()
 	IF = auto()
 	INHERITS = auto()
 	NOT = auto()
@@ -45,6 +46,7 @@ class TokenType(Enum):
 	RETURN = auto()
 	SUPER = auto()
 	THIS = auto()
+	TO = auto()
 	TRUE = auto()
 	VARIABLE = auto()
 	WHILE = auto()
@@ -0,0 +1,25 @@
+from Callable import Callable
+import Stmt
+from functools import partial
+from typing import Any, List, override
+
+class TranspiledFunction(Callable):
+    __slots__ = ('declaration', 'function', 'isInitializer', 'minArity', 'maxArity')
+
+    def __init__(self, declaration: Stmt.Function, function: Any, isInitializer: bool) -> None:
+        self.declaration: Stmt.Function = declaration
+        self.function: Any = function
+        self.isInitializer: bool = isInitializer
+        self.minArity: int = len(declaration.params)
+        self.maxArity: int = self.minArity
+
+    def bind(self, instance: 'Instance') -> 'TranspiledFunction':
+        return TranspiledFunction(self.declaration, partial(self.function, instance), self.isInitializer)
+
+    @override
+    def call(self, interpreter, arguments: List[Any]) -> Any:
+        return self.function(*arguments)
+
+    @override
+    def __str__(self) -> str:
+        return f'<function "{self.declaration.name.lexeme}">'
@@ -0,0 +1,331 @@
+from Expr import Expr, Variable, Assign, Binary, Call, Grouping, Literal, Unary, This, Set, Get, Super
+from Stmt import Stmt, Block, Var, Function, Expression, If, Return, While, For, Class
+from TokenType import TokenType
+from typing import Any, List, override
+import operator
+
+# What a specialized Binary runs once its operands passed their guards
+OPERATIONS: dict[TokenType, Any] = {
+    TokenType.PLUS: operator.add,
+    TokenType.MINUS: operator.sub,
+    TokenType.STAR: operator.mul,
+    TokenType.SLASH: operator.truediv,
+    TokenType.GREATER: operator.gt,
+    TokenType.GREATER_EQUAL: operator.ge,
+    TokenType.LESS: operator.lt,
+    TokenType.LESS_EQUAL: operator.le,
+}
+
+# An inferred type is (type, certain), or None when nothing is known. Certain types hold on every run,
+# the others are only likely, like those of globals a later REPL line could reassign, and stay guarded
+Inferred = tuple[type, bool] | None
+
+NUMBER: Inferred = (float, True)
+STRING: Inferred = (str, True)
+
+# A binding no value has reached yet. Until one does it could still hold anything, like the native a global
+# assigned only to itself keeps, so joining it with a type only makes that type likely
+UNSET: Any = object()
+
+class Binding:
+    __slots__ = ('sources', 'isGlobal', 'inferred')
+
+    def __init__(self, isGlobal: bool) -> None:
+        # Every expression assigned to the binding, or the inferred type of values given to it otherwise
+        self.sources: List[Expr | Inferred] = []
+        self.isGlobal: bool = isGlobal
+        self.inferred: Inferred = UNSET
+
+class TypeInference(Expr.Visitor, Stmt.Visitor):
+    # Runs on the resolved tree and marks arithmetic whose operand types are known, so backends can skip the checks
+    # for operands that are certain and run the operation directly, falling back to the generic path when a guard fails
+    def __init__(self) -> None:
+        self.scopes: List[dict[str, Binding]] = []
+        self.globals: dict[str, Binding] = {}
+        self.declared: List[Binding] = []
+        self.variables: dict[Variable, Binding] = {}
+        self.binaries: List[Binary] = []
+
+    def inferStatements(self, statements: List[Stmt]) -> None:
+        self.walkStatements(statements)
+
+        # Starting from no values, a binding only narrows again when a source first leaves UNSET, which happens once,
+        # and otherwise only widens, so this ends once every source has been accounted for
+        changed: bool = True
+
+        while changed:
+            changed = False
+
+            for binding in self.declared:
+                inferred: Inferred = self.infer(binding)
+
+                if inferred != binding.inferred:
+                    binding.inferred = inferred
+                    changed = True
+
+        # What no value ever reached holds whatever was there before, so nothing is known about it
+        for binding in self.declared:
+            if binding.inferred is UNSET:
+                binding.inferred = None
+
+        for expr in self.binaries:
+            self.specialize(expr)
+
+    # Statements
+
+    @override
+    def visitBlockStmt(self, stmt: Block) -> None:
+        # Scopes are mirrored from the resolver, so a depth it computed finds the same binding here
+        if stmt.size == 0:
+            self.walkStatements(stmt.statements)
+            return
+
+        self.scopes.append({})
+        self.walkStatements(stmt.statements)
+        self.scopes.pop()
+
+    @override
+    def visitVarStmt(self, stmt: Var) -> None:
+        binding: Binding = self.declare(stmt.name.lexeme)
+
+        if stmt.initializer is None:
+            binding.sources.append(None)
+            return
+
+        binding.sources.append(stmt.initializer)
+        stmt.initializer.accept(self)
+
+    @override
+    def visitFunctionStmt(self, stmt: Function) -> None:
+        self.declare(stmt.name.lexeme).sources.append(None)
+        self.walkFunction(stmt)
+
+    @override
+    def visitClassStmt(self, stmt: Class) -> None:
+        self.declare(stmt.name.lexeme).sources.append(None)
+
+        if stmt.superclass is not None:
+            stmt.superclass.accept(self)
+            self.scopes.append({})
+
+        self.scopes.append({})
+
+        for method in stmt.methods:
+            self.walkFunction(method)
+
+        self.scopes.pop()
+
+        if stmt.superclass is not None:
+            self.scopes.pop()
+
+    @override
+    def visitExpressionStmt(self, stmt: Expression) -> None:
+        stmt.expression.accept(self)
+
+    @override
+    def visitIfStmt(self, stmt: If) -> None:
+        stmt.condition.accept(self)
+        stmt.thenBranch.accept(self)
+
+        if stmt.elseBranch is not None:
+            stmt.elseBranch.accept(self)
+
+    @override
+    def visitWhileStmt(self, stmt: While) -> None:
+        stmt.condition.accept(self)
+        stmt.body.accept(self)
+
+    @override
+    def visitForStmt(self, stmt: For) -> None:
+        stmt.start.accept(self)
+        stmt.end.accept(self)
+
+        # The loop checks its bounds and counter are numbers, only the body can put something else in it
+        self.scopes.append({})
+        self.declare(stmt.name.lexeme).sources.append(NUMBER)
+        stmt.body.accept(self)
+        self.scopes.pop()
+
+    @override
+    def visitReturnStmt(self, stmt: Return) -> None:
+        if stmt.value is not None:
+            stmt.value.accept(self)
+
+    # Expressions
+
+    @override
+    def visitVariableExpr(self, expr: Variable) -> None:
+        self.variables[expr] = self.lookup(expr.name.lexeme, expr.depth)
+
+    @override
+    def visitAssignExpr(self, expr: Assign) -> None:
+        expr.value.accept(self)
+        self.lookup(expr.name.lexeme, expr.depth).sources.append(expr.value)
+
+    @override
+    def visitBinaryExpr(self, expr: Binary) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+        if expr.operator.type in OPERATIONS:
+            self.binaries.append(expr)
+
+    @override
+    def visitCallExpr(self, expr: Call) -> None:
+        expr.callee.accept(self)
+
+        for argument in expr.arguments:
+            argument.accept(self)
+
+    @override
+    def visitGetExpr(self, expr: Get) -> None:
+        expr.object.accept(self)
+
+    @override
+    def visitSetExpr(self, expr: Set) -> None:
+        expr.value.accept(self)
+        expr.object.accept(self)
+
+    @override
+    def visitGroupingExpr(self, expr: Grouping) -> None:
+        expr.expression.accept(self)
+
+    @override
+    def visitUnaryExpr(self, expr: Unary) -> None:
+        expr.right.accept(self)
+
+    @override
+    def visitLiteralExpr(self, expr: Literal) -> None:
+        pass
+
+    @override
+    def visitThisExpr(self, expr: This) -> None:
+        pass
+
+    @override
+    def visitSuperExpr(self, expr: Super) -> None:
+        pass
+
+    # Inference
+
+    def infer(self, binding: Binding) -> Inferred:
+        # A global no statement here declares or assigns is a native or comes from an earlier REPL line
+        if binding.sources == []:
+            return None
+
+        types: List[Inferred] = [self.typeOf(source) if isinstance(source, Expr) else source for source in binding.sources]
+        inferred: Inferred = types[0]
+
+        for other in types[1:]:
+            inferred = self.join(inferred, other)
+
+        if binding.isGlobal and inferred is not UNSET and inferred is not None:
+            return (inferred[0], False)
+
+        return inferred
+
+    def typeOf(self, expr: Expr) -> Inferred:
+        match expr:
+            case Literal():
+                if type(expr.value) is float: return NUMBER
+                if type(expr.value) is str: return STRING
+                return None
+
+            case Variable():
+                return self.variables[expr].inferred
+
+            case Assign():
+                return self.typeOf(expr.value)
+
+            case Grouping():
+                return self.typeOf(expr.expression)
+
+            case Unary():
+                # Negation either gives a number or fails
+                return NUMBER if expr.operator.type == TokenType.MINUS else None
+
+            case Binary():
+                return self.typeOfBinary(expr)
+
+        return None
+
+    def typeOfBinary(self, expr: Binary) -> Inferred:
+        match expr.operator.type:
+            case TokenType.OR | TokenType.AND:
+                return self.join(self.typeOf(expr.left), self.typeOf(expr.right))
+
+            case TokenType.PLUS:
+                left: Inferred = self.typeOf(expr.left)
+                right: Inferred = self.typeOf(expr.right)
+
+                # With one side certain, the addition either gives that type or fails
+                if NUMBER in (left, right): return NUMBER
+                if STRING in (left, right): return STRING
+
+                return self.join(left, right)
+
+            case TokenType.MINUS | TokenType.STAR | TokenType.SLASH:
+                return NUMBER
+
+        return None
+
+    def specialize(self, expr: Binary) -> None:
+        left: Inferred = self.typeOf(expr.left)
+        right: Inferred = self.typeOf(expr.right)
+
+        # Every other operator only works on numbers, so it is specialized even when nothing is known about its operands
+        if expr.operator.type == TokenType.PLUS:
+            known: set[type] = {side[0] for side in (left, right) if side is not None}
+
+            if len(known) != 1:
+                return
+
+            expr.operands = known.pop()
+
+        else:
+            expr.operands = float
+
+        expr.guardLeft = left != (expr.operands, True)
+        expr.guardRight = right != (expr.operands, True)
+
+    def join(self, a: Inferred, b: Inferred) -> Inferred:
+        if a is UNSET: return b if b is UNSET or b is None else (b[0], False)
+        if b is UNSET: return a if a is None else (a[0], False)
+        if a is None or b is None or a[0] is not b[0]: return None
+
+        return (a[0], a[1] and b[1])
+
+    # Helpers
+
+    def walkStatements(self, statements: List[Stmt]) -> None:
+        for statement in statements:
+            statement.accept(self)
+
+    def walkFunction(self, function: Function) -> None:
+        self.scopes.append({})
+
+        for param in function.params:
+            self.declare(param.lexeme).sources.append(None)
+
+        self.walkStatements(function.body)
+        self.scopes.pop()
+
+    def declare(self, name: str) -> Binding:
+        if self.scopes == []:
+            return self.lookup(name, None)
+
+        binding: Binding = Binding(False)
+        self.scopes[-1][name] = binding
+        self.declared.append(binding)
+
+        return binding
+
+    def lookup(self, name: str, depth: int) -> Binding:
+        if depth is not None:
+            return self.scopes[-1 - depth][name]
+
+        if name not in self.globals:
+            self.globals[name] = Binding(True)
+            self.declared.append(self.globals[name])
+
+        return self.globals[name]
@@ -0,0 +1,454 @@
+from Expr import Get, Set
+from Stmt import Stmt, Function, Class
+from Compiler import Compiler
+from Chunk import Chunk
+from OpCode import OpCode
+
+from Environment import Environment
+from FunctionCall import FunctionCall
+from Return import Return_
+from ClassCall import ClassCall
+from Instance import Instance
+from Callable import MAX_CALL_DEPTH
+
+from Token import Token
+
+from ErrorHandler import ErrorHandler
+from RuntimeError import RuntimeError
+
+from lib.StdLib import defineStdLib
+from language.Language import Language
+
+from typing import Any, List
+
+# Chunks store opcodes as plain ints, comparing those is much cheaper than comparing enum members
+
+ADD = int(OpCode.ADD)
+CALL = int(OpCode.CALL)
+CHECK_CALL = int(OpCode.CHECK_CALL)
+CHECK_INSTANCE = int(OpCode.CHECK_INSTANCE)
+CLASS = int(OpCode.CLASS)
+CONSTANT = int(OpCode.CONSTANT)
+DEFINE = int(OpCode.DEFINE)
+DEFINE_LOCAL = int(OpCode.DEFINE_LOCAL)
+DIVIDE = int(OpCode.DIVIDE)
+EQUAL = int(OpCode.EQUAL)
+FOR_ENTER = int(OpCode.FOR_ENTER)
+FOR_NEXT = int(OpCode.FOR_NEXT)
+FOR_NEXT_FRESH = int(OpCode.FOR_NEXT_FRESH)
+FUNCTION = int(OpCode.FUNCTION)
+GET_GLOBAL = int(OpCode.GET_GLOBAL)
+GET_LOCAL = int(OpCode.GET_LOCAL)
+GET_PROPERTY = int(OpCode.GET_PROPERTY)
+GET_SUPER = int(OpCode.GET_SUPER)
+GREATER = int(OpCode.GREATER)
+GREATER_EQUAL = int(OpCode.GREATER_EQUAL)
+HALT = int(OpCode.HALT)
+JUMP = int(OpCode.JUMP)
+JUMP_IF_FALSE = int(OpCode.JUMP_IF_FALSE)
+JUMP_IF_FALSE_KEEP = int(OpCode.JUMP_IF_FALSE_KEEP)
+JUMP_IF_TRUE_KEEP = int(OpCode.JUMP_IF_TRUE_KEEP)
+LESS = int(OpCode.LESS)
+LESS_EQUAL = int(OpCode.LESS_EQUAL)
+MULTIPLY = int(OpCode.MULTIPLY)
+NEGATE = int(OpCode.NEGATE)
+NONE = int(OpCode.NONE)
+NOT = int(OpCode.NOT)
+NOT_EQUAL = int(OpCode.NOT_EQUAL)
+POP = int(OpCode.POP)
+POP_SCOPE = int(OpCode.POP_SCOPE)
+PRINT = int(OpCode.PRINT)
+PUSH_SCOPE = int(OpCode.PUSH_SCOPE)
+RETURN = int(OpCode.RETURN)
+SET_GLOBAL = int(OpCode.SET_GLOBAL)
+SET_LOCAL = int(OpCode.SET_LOCAL)
+SET_PROPERTY = int(OpCode.SET_PROPERTY)
+SUBTRACT = int(OpCode.SUBTRACT)
+
+class VM:
+    def __init__(self, errorHandler: ErrorHandler, language: Language, maxCallDepth: int = MAX_CALL_DEPTH) -> None:
+        self.globals: Environment = Environment()
+
+        self.errorHandler = errorHandler
+        self.language = language
+
+        # Calls live on the VM's own frame stack, so only this limit bounds their depth
+        self.maxCallDepth: int = maxCallDepth
+
+        defineStdLib(self.globals, self.language)
+
+    def interpret(self, statements: List[Stmt], isREPL: bool) -> None:
+        chunk: Chunk = Compiler().compile(statements, isREPL)
+
+        try:
+            self.run(chunk)
+
+        except RuntimeError as error:
+            self.errorHandler.runtimeError(error)
+
+    def run(self, chunk: Chunk) -> None:
+        stack: List[Any] = []
+        frames: List[tuple] = []
+
+        code = chunk.code
+        constants = chunk.constants
+        ip: int = 0
+        environment: Environment = self.globals
+        function: FunctionCall = None
+
+        push = stack.append
+        pop = stack.pop
+        globalValues: dict[str, Any] = self.globals.values
+        maxCallDepth: int = self.maxCallDepth
+
+        while True:
+            op, a, b = code[ip]
+            ip += 1
+
+            # Ordered roughly by how often they run in typical programs
+
+            if op == GET_LOCAL:
+                scope: Environment = environment
+
+                for _ in range(a):
+                    scope = scope.enclosing
+
+                push(scope.slots[b])
+
+            elif op == GET_GLOBAL:
+                name = constants[a]
+
+                if name.lexeme in globalValues:
+                    push(globalValues[name.lexeme])
+
+                else:
+                    push(self.globals.get(name))
+
+            elif op == CONSTANT:
+                push(constants[a])
+
+            elif op == POP:
+                pop()
+
+            elif op == JUMP_IF_FALSE:
+                value = pop()
+
+                if value is None or value is False:
+                    ip = a
+
+            elif op == JUMP:
+                ip = a
+
+            elif op == FOR_NEXT:
+                slots = environment.slots
+                counter = slots[0]
+
+                if type(counter) is not float:
+                    raise RuntimeError(constants[b], 'Loop variable must be a number')
+
+                slots[0] = counter = counter + 1
+
+                if counter <= slots[1]:
+                    ip = a
+
+            elif op == ADD:
+                right = pop()
+                left = stack[-1]
+
+                if type(left) is float and type(right) is float: stack[-1] = left + right
+                elif type(left) is str and type(right) is str: stack[-1] = left + right
+                else: raise RuntimeError(constants[a], 'Operands must be two numbers or two strings')
+
+            elif op == SUBTRACT:
+                right = pop()
+                left = stack[-1]
+
+                if not(type(left) is float and type(right) is float):
+                    raise RuntimeError(constants[a], 'Operands must be numbers')
+
+                stack[-1] = left - right
+
+            elif op == LESS:
+                right = pop()
+                left = stack[-1]
+
+                if not(type(left) is float and type(right) is float):
+                    raise RuntimeError(constants[a], 'Operands must be numbers')
+
+                stack[-1] = left < right
+
+            elif op == GREATER:
+                right = pop()
+                left = stack[-1]
+
+                if not(type(left) is float and type(right) is float):
+                    raise RuntimeError(constants[a], 'Operands must be numbers')
+
+                stack[-1] = left > right
+
+            elif op == MULTIPLY:
+                right = pop()
+                left = stack[-1]
+
+                if not(type(left) is float and type(right) is float):
+                    raise RuntimeError(constants[a], 'Operands must be numbers')
+
+                stack[-1] = left * right
+
+            elif op == DIVIDE:
+                right = pop()
+                left = stack[-1]
+
+                if not(type(left) is float and type(right) is float):
+                    raise RuntimeError(constants[a], 'Operands must be numbers')
+
+                stack[-1] = left / right
+
+            elif op == LESS_EQUAL:
+                right = pop()
+                left = stack[-1]
+
+                if not(type(left) is float and type(right) is float):
+                    raise RuntimeError(constants[a], 'Operands must be numbers')
+
+                stack[-1] = left <= right
+
+            elif op == GREATER_EQUAL:
+                right = pop()
+                left = stack[-1]
+
+                if not(type(left) is float and type(right) is float):
+                    raise RuntimeError(constants[a], 'Operands must be numbers')
+
+                stack[-1] = left >= right
+
+            elif op == SET_LOCAL:
+                scope: Environment = environment
+
+                for _ in range(a):
+                    scope = scope.enclosing
+
+                scope.slots[b] = stack[-1]
+
+            elif op == SET_GLOBAL:
+                self.globals.assign(constants[a], stack[-1])
+
+            elif op == CHECK_CALL:
+                callee = stack[-1]
+                expr = constants[b]
+
+                try:
+                    if not callee.minArity <= a <= callee.maxArity:
+                        raise RuntimeError(expr.paren, callee.arityMessage(a))
+
+                except AttributeError:
+                    raise RuntimeError(expr.paren, 'Can only call functions and classes') from None
+
+            elif op == CALL:
+                start: int = len(stack) - a
+                callee = stack[start - 1]
+
+                if isinstance(callee, ClassCall):
+                    instance: Instance = Instance(callee)
+                    initializer: FunctionCall = callee.initializer
+
+                    if initializer is None:
+                        del stack[start:]
+                        stack[-1] = instance
+                        continue
+
+                    callee = initializer.bind(instance)
+
+                elif not isinstance(callee, FunctionCall):
+                    value = callee.function(*stack[start:])
+                    del stack[start - 1:]
+                    push(value)
+                    continue
+
+                # A call in tail position takes over the running frame, so tail recursion does not grow the frame stack
+                if not constants[b].tail or callee.isInitializer:
+                    if len(frames) >= maxCallDepth:
+                        raise RuntimeError(constants[b].paren, 'Maximum call depth exceeded')
+
+                    frames.append((code, constants, ip, environment, function))
+
+                environment = Environment(callee.closure, callee.declaration.size)
+                environment.slots[:a] = stack[start:]
+                del stack[start - 1:]
+
+                code = callee.compiled.code
+                constants = callee.compiled.constants
+                ip = 0
+                function = callee
+
+            elif op == RETURN:
+                value = pop()
+
+                if function is None:
+                    raise Return_(value)
+
+                if function.isInitializer:
+                    value = function.closure.slots[0]
+
+                code, constants, ip, environment, function = frames.pop()
+                push(value)
+
+            elif op == NONE:
+                push(None)
+
+            elif op == JUMP_IF_FALSE_KEEP:
+                value = stack[-1]
+
+                if value is None or value is False:
+                    ip = a
+
+            elif op == JUMP_IF_TRUE_KEEP:
+                value = stack[-1]
+
+                if not(value is None or value is False):
+                    ip = a
+
+            elif op == EQUAL:
+                right = pop()
+                stack[-1] = stack[-1] == right
+
+            elif op == NOT_EQUAL:
+                right = pop()
+                stack[-1] = stack[-1] != right
+
+            elif op == NOT:
+                value = stack[-1]
+                stack[-1] = value is None or value is False
+
+            elif op == NEGATE:
+                if not isinstance(stack[-1], float):
+                    raise RuntimeError(constants[a], 'Operand must be a number')
+
+                stack[-1] = -stack[-1]
+
+            elif op == GET_PROPERTY:
+                object = stack[-1]
+
+                if not isinstance(object, Instance):
+                    raise RuntimeError(constants[a].name, 'Only instances have properties')
+
+                expr: Get = constants[a]
+
+                if object.shape is not expr.shape:
+                    stack[-1] = object.getProperty(expr)
+
+                elif expr.index is not None:
+                    stack[-1] = object.values[expr.index]
+
+                else:
+                    stack[-1] = object.getMethod(expr.name)
+
+            elif op == CHECK_INSTANCE:
+                if not isinstance(stack[-1], Instance):
+                    raise RuntimeError(constants[a], 'Only instances have fields')
+
+            elif op == SET_PROPERTY:
+                value = pop()
+                object = stack[-1]
+                expr: Set = constants[a]
+
+                if object.shape is expr.shape and expr.transition is None:
+                    object.values[expr.index] = value
+
+                else:
+                    object.setProperty(expr, value)
+
+                stack[-1] = value
+
+            elif op == PUSH_SCOPE:
+                environment = Environment(environment, a)
+
+            elif op == POP_SCOPE:
+                environment = environment.enclosing
+
+            elif op == FOR_NEXT_FRESH:
+                slots = environment.slots
+                counter = slots[0]
+
+                if type(counter) is not float:
+                    raise RuntimeError(constants[b], 'Loop variable must be a number')
+
+                counter = counter + 1
+
+                if counter <= slots[1]:
+                    environment = Environment(environment.enclosing, 2)
+                    environment.slots[0] = counter
+                    environment.slots[1] = slots[1]
+                    ip = a
+
+            elif op == FOR_ENTER:
+                last = pop()
+                first = pop()
+
+                if type(first) is not float or type(last) is not float:
+                    raise RuntimeError(constants[b].keyword, 'Loop bounds must be numbers')
+
+                environment = Environment(environment, 2)
+                environment.slots[0] = first
+                environment.slots[1] = last
+
+                if first > last:
+                    ip = a
+
+            elif op == DEFINE:
+                environment.define(constants[a], pop())
+
+            elif op == DEFINE_LOCAL:
+                environment.slots[a] = pop()
+
+            elif op == FUNCTION:
+                declaration, functionChunk = constants[a]
+                push(FunctionCall(declaration, environment, False, self.language, functionChunk))
+
+            elif op == GET_SUPER:
+                method = constants[b]
+
+                superclass: ClassCall = environment.getAt(a, 0)
+                object: Instance = environment.getAt(a - 1, 0)
+
+                superMethod: FunctionCall = superclass.findMethod(method.lexeme)
+
+                if superMethod is None:
+                    raise RuntimeError(method, f'Undefined property {method.lexeme}')
+
+                push(superMethod.bind(object))
+
+            elif op == CLASS:
+                self.defineClass(environment, pop(), *constants[a])
+
+            elif op == PRINT:
+                print(pop())
+
+            elif op == HALT:
+                return
+
+    def defineClass(self, environment: Environment, superclass: Any, stmt: Class, methodChunks: List[tuple[Function, Chunk]]) -> None:
+        if stmt.superclass is not None and not isinstance(superclass, ClassCall):
+            raise RuntimeError(stmt.superclass.name, 'Superclass must be a class')
+
+        self.declare(environment, stmt.name, stmt.slot, None)
+
+        closure: Environment = environment
+
+        if stmt.superclass is not None:
+            closure = Environment(environment, 1)
+            closure.slots[0] = superclass
+
+        methods: dict[str, FunctionCall] = {}
+
+        for method, chunk in methodChunks:
+            methods[method.name.lexeme] = FunctionCall(method, closure, method.name.lexeme == self.language.initName, self.language, chunk)
+
+        self.declare(environment, stmt.name, stmt.slot, ClassCall(stmt.name.lexeme, superclass, methods))
+
+    def declare(self, environment: Environment, name: Token, slot: int, value: Any) -> None:
+        if slot is None:
+            environment.define(name.lexeme, value)
+
+        else:
+            environment.slots[slot] = value
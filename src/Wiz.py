@@ -1,43 +1,198 @@
 from language.Language import Language
 from Scanner import Scanner
+from RegexScanner import RegexScanner
 from Parser import Parser
-from Interpreter import Interpreter
 from Resolver import Resolver
+from Optimizer import Optimizer
+from TypeInference import TypeInference
+from AstPrinter import AstPrinter
+from Profiler import Profiler
+from Sampler import Sampler, SAMPLE_INTERVAL
+from LineProfiler import LineProfiler
+from Statistics import Statistics
+from AstCache import AstCache
+from Interpreter import Interpreter
+from ClosureCompiler import ClosureCompiler
+from PythonTranspiler import PythonTranspiler
+from VM import VM
+from Callable import MAX_CALL_DEPTH
 from ErrorHandler import ErrorHandler
 from Stmt import Stmt
 from Token import Token
 from typing import List
 from sys import argv, exit
 from re import search
+from os import environ, path
 import keyboard
 
+version: str = '0.0.1'
+
+cacheDirectory: str = path.join(environ.get('XDG_CACHE_HOME') or path.join(path.expanduser('~'), '.cache'), 'wiz')
+cacheSize: int = 64 * 1024 * 1024
+
+backends: dict[str, type] = {
+    'vm': VM,
+    'closure': ClosureCompiler,
+    'python': PythonTranspiler,
+    'tree': Interpreter,
+}
+
+profilers: dict[str, type] = {
+    'profile': Profiler,
+    'sample': Sampler,
+    'line-profile': LineProfiler,
+}
+
+# The character-by-character Scanner is kept as the reference the regex scanner is checked against
+scanners: dict[str, type] = {
+    'regex': RegexScanner,
+    'reference': Scanner,
+}
+
 class Wiz:
     def __init__(self) -> None:
         self.language: Language
         self.errorHandler: ErrorHandler
-        self.interpreter: Interpreter
+        self.interpreter: VM | ClosureCompiler | PythonTranspiler | Interpreter
+        self.backend: str = 'vm'
+        self.scanner: str = 'regex'
+        self.stream: bool = False
+        self.maxCallDepth: int = MAX_CALL_DEPTH
+        self.optimize: bool = True
+        self.dump: bool = False
+        self.profiler: Profiler | Sampler | LineProfiler = None
+        self.profileReport: str = None
+        self.sampleInterval: float = SAMPLE_INTERVAL
+        self.stats: bool = False
+        # Directory of the AST cache, None without one. The cache is only built once the options are known
+        self.cacheDirectory: str = cacheDirectory
+        self.cache: AstCache = None
 
     def main(self) -> None:
-        if len(argv) > 2:
-            print('Usage: wiz [script].wiz')
+        options: List[str] = [argument for argument in argv[1:] if argument.startswith('--')]
+        arguments: List[str] = [argument for argument in argv[1:] if not argument.startswith('--')]
+
+        for option in options:
+            self.setOption(option)
+
+        if self.cacheDirectory is not None:
+            self.cache = AstCache(self.cacheDirectory, version, cacheSize)
+
+        # The profilers and statistics wrap the calls of the tree-walking interpreter, the other backends make theirs inline
+        if self.profiler is not None or self.stats:
+            self.backend = 'tree'
+
+        # Both replace the same interpreter methods with their own
+        if self.profiler is not None and self.stats:
+            print('Statistics cannot be collected while profiling')
+            exit(64)
+
+        if isinstance(self.profiler, Sampler):
+            self.profiler.interval = self.sampleInterval
+
+        # Lines are counted by their number, which every prompt input starts over
+        if isinstance(self.profiler, LineProfiler) and not arguments:
+            print('Line profiling can only be used when running a file')
             exit(64)
 
-        elif len(argv) == 2:
-            if not argv[1].endswith('.wiz'):
+        if len(arguments) > 1:
+            print('Usage: wiz [--backend=vm|closure|python|tree] [--scanner=regex|reference] [--stream] [--cache=directory|--no-cache] [--max-depth=calls] [--no-optimize] [--dump-ast] [--profile[=report.json]] [--sample[=stacks.folded]] [--sample-interval=ms] [--line-profile[=report.json]] [--stats] [script].wiz')
+            exit(64)
+
+        elif len(arguments) == 1:
+            if not arguments[0].endswith('.wiz'):
                 print('Can only run files ending with ".wiz" extension')
                 exit(64)
 
-            self.runFile(argv[1])
+            self.runFile(arguments[0])
 
         else:
             self.runPrompt()
 
+    def setOption(self, option: str) -> None:
+        name, _, value = option[2:].partition('=')
+
+        match name:
+            case 'backend':
+                if value not in backends:
+                    print(f'Unknown backend "{value}", expected one of: {", ".join(backends)}')
+                    exit(64)
+
+                self.backend = value
+
+            case 'scanner':
+                if value not in scanners:
+                    print(f'Unknown scanner "{value}", expected one of: {", ".join(scanners)}')
+                    exit(64)
+
+                self.scanner = value
+
+            case 'stream':
+                self.stream = True
+
+            case 'cache':
+                if value == '':
+                    print('Missing cache directory, expected --cache=directory')
+                    exit(64)
+
+                self.cacheDirectory = value
+
+            case 'no-cache':
+                self.cacheDirectory = None
+
+            case 'max-depth':
+                if not value.isdigit() or int(value) == 0:
+                    print(f'Invalid call depth "{value}", expected a positive number')
+                    exit(64)
+
+                self.maxCallDepth = int(value)
+
+            case 'no-optimize':
+                self.optimize = False
+
+            case 'dump-ast':
+                self.dump = True
+
+            case 'profile' | 'sample' | 'line-profile':
+                if self.profiler is not None:
+                    print('Only one of --profile, --sample and --line-profile can be used at a time')
+                    exit(64)
+
+                self.profiler = profilers[name]()
+                self.profileReport = value or None
+
+            case 'stats':
+                self.stats = True
+
+            case 'sample-interval':
+                try:
+                    interval: float = float(value)
+
+                except ValueError:
+                    interval = 0.0
+
+                if not interval > 0:
+                    print(f'Invalid sample interval "{value}", expected a positive number of milliseconds')
+                    exit(64)
+
+                self.sampleInterval = interval
+
+            case _:
+                print(f'Unknown option "{option}"')
+                exit(64)
+
     def runFile(self, path: str) -> None:
         try:
             with open(path, 'r') as file:
                 source = file.read()
                 self.findLanguage(source)
-                self.run(source, False)
+                self.run(source, False, self.cache)
+
+                if self.profiler is not None:
+                    self.reportProfile(self.profileReport or f'{path.removesuffix(".wiz")}{self.profiler.reportExtension}')
+
+                if self.stats:
+                    self.reportStatistics()
 
         except FileNotFoundError as error:
             print(f'\033[31mError: File not found\033[0m\n')
@@ -50,7 +205,7 @@ class Wiz:
 
     def runPrompt(self) -> None:
         try:
-            print('Wiz v0.0.1')
+            print(f'Wiz v{version}')
             self.selectLanguage()
 
             while True:
@@ -58,23 +213,90 @@ class Wiz:
                 self.errorHandler.hadError = False
 
         except KeyboardInterrupt:
+            if self.profiler is not None:
+                self.reportProfile(self.profileReport or f'wiz{self.profiler.reportExtension}')
+
+            if self.stats:
+                self.reportStatistics()
+
             print('\nExiting...')
             exit(0)
 
-    def run(self, source: str, isREPL: bool) -> None:
-        scanner = Scanner(source, self.language.keywords, self.errorHandler)
-        tokens: List[Token] = scanner.scanTokens()
-        if self.errorHandler.hadError: return
+    def run(self, source: str, isREPL: bool, cache: AstCache = None) -> None:
+        statements: List[Stmt] = None
+        # Optimized and unoptimized trees of the same source are different entries
+        variant: str = self.language.languageName if self.optimize else f'{self.language.languageName} unoptimized'
+
+        if cache is not None:
+            statements = cache.load(source, variant)
+
+        if statements is None:
+            statements = self.parse(source)
+            if statements is None: return
+
+            if cache is not None:
+                cache.store(source, variant, statements)
+
+        else:
+            # Runtime errors quote the source, which the scanner would otherwise have provided
+            self.errorHandler.lines = source.splitlines()
+            self.errorHandler.lines.append('')
+
+        if self.dump:
+            print(AstPrinter().print(statements))
+            return
+
+        if self.profiler is not None:
+            self.profiler.run(self.interpreter, statements, isREPL)
+            return
+
+        if self.stats:
+            self.interpreter.startStatistics()
+
+        self.interpreter.interpret(statements, isREPL)
+
+    def reportProfile(self, report: str) -> None:
+        self.profiler.printReport()
+
+        try:
+            self.profiler.writeReport(report)
+            print(f'\nProfile written to {report}')
+
+        except OSError as error:
+            print(f'\nCould not write profile to {report}: {error.strerror}')
+
+    def reportStatistics(self) -> None:
+        # Nothing was counted when the program did not get to run
+        statistics: Statistics = self.interpreter.stopStatistics()
+
+        if statistics is not None:
+            statistics.printReport()
+
+    def parse(self, source: str) -> List[Stmt]:
+        scanner = scanners[self.scanner](source, self.language.keywordTrie, self.errorHandler)
+
+        if self.stream:
+            # Scanning happens while parsing, so scanner errors are only known once parsing ends
+            parser = Parser(scanner.streamTokens(), self.errorHandler)
+
+        else:
+            tokens: List[Token] = scanner.scanTokens()
+            if self.errorHandler.hadError: return None
+
+            parser = Parser(tokens, self.errorHandler)
 
-        parser = Parser(tokens, self.errorHandler)
         statements: List[Stmt] = parser.parse()
-        if self.errorHandler.hadError: return
+        if self.errorHandler.hadError: return None
 
-        resolver = Resolver(self.interpreter, self.errorHandler, self.language)
+        resolver = Resolver(self.errorHandler, self.language)
         resolver.resolveStatements(statements)
-        if self.errorHandler.hadError: return
+        if self.errorHandler.hadError: return None
 
-        self.interpreter.interpret(statements, isREPL)
+        if self.optimize:
+            statements = Optimizer().optimizeStatements(statements)
+            TypeInference().inferStatements(statements)
+
+        return statements
 
     def findLanguage(self, source: str) -> None:
         matchLanguage = search(r'^\s*@\s*(\w+)', source)
@@ -98,7 +320,7 @@ class Wiz:
 
         self.language = Language(language)
         self.errorHandler = ErrorHandler(self.language.errors)
-        self.interpreter = Interpreter(self.errorHandler, self.language)
+        self.interpreter = backends[self.backend](self.errorHandler, self.language, self.maxCallDepth)
 
     def selectLanguage(self) -> None:
         languages = ['English', 'Português']
@@ -136,7 +358,7 @@ class Wiz:
 
                 self.language = Language(languageName)
                 self.errorHandler = ErrorHandler(self.language.errors)
-                self.interpreter = Interpreter(self.errorHandler, self.language)
+                self.interpreter = backends[self.backend](self.errorHandler, self.language, self.maxCallDepth)
                 break
 
 if __name__ == '__main__':
@@ -0,0 +1,31 @@
+from TokenType import TokenType
+from typing import List
+
+class KeywordTrie:
+    # One node per word, so multi-word keywords sharing their first words share nodes
+    def __init__(self) -> None:
+        self.type: TokenType = None
+        self.children: dict[str, KeywordTrie] = {}
+        # Every keyword starting at this node, longest first, to report incomplete keywords
+        self.keywords: List[str] = []
+
+    def insert(self, keyword: str, type: TokenType) -> None:
+        node: KeywordTrie = self
+
+        for word in keyword.split():
+            node = node.children.setdefault(word, KeywordTrie())
+
+        node.type = type
+
+    @staticmethod
+    def build(keywords: dict[str, TokenType]) -> 'KeywordTrie':
+        root: KeywordTrie = KeywordTrie()
+
+        for keyword, type in keywords.items():
+            root.insert(keyword, type)
+            root.children[keyword.split()[0]].keywords.append(keyword)
+
+        for node in root.children.values():
+            node.keywords.sort(key=len, reverse=True)
+
+        return root
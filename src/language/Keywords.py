@@ -8,6 +8,7 @@ english = {
     'end': TokenType.END,
     'false': TokenType.FALSE,
     'for': TokenType.FOR,
+    'from': TokenType.FROM,
     'function': TokenType.FUNCTION,
     'if': TokenType.IF,
     'inherits': TokenType.INHERITS,
@@ -17,6 +18,7 @@ english = {
     'return': TokenType.RETURN,
     'super': TokenType.SUPER,
     'this': TokenType.THIS,
+    'to': TokenType.TO,
     'true': TokenType.TRUE,
     'variable': TokenType.VARIABLE,
     'while': TokenType.WHILE,
@@ -40,6 +42,8 @@ portuguese = {
     'fim': TokenType.END,
     'falso': TokenType.FALSE,
     'para': TokenType.FOR,
+    'de': TokenType.FROM,
+    'ate': TokenType.TO,
     'funcao': TokenType.FUNCTION,
     'se': TokenType.IF,
     'herda': TokenType.INHERITS,
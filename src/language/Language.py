@@ -1,14 +1,38 @@
 from language.Keywords import keywords
 from language.Errors import errors
 from language.StdLibNames import stdLibNames
+from language.KeywordTrie import KeywordTrie
 from TokenType import TokenType
 from ErrorType import ErrorType
 from lib.StdLibTypes import StdLibTypes
+from types import MappingProxyType
+from typing import Mapping
+
+# Built once per language and shared by every Scanner
+keywordTries: dict[str, KeywordTrie] = {}
 
 class Language:
     def __init__(self, languageName: str) -> None:
         self.languageName: str = languageName
         self.keywords: dict[str, TokenType] = keywords[languageName]
+        self.keywordTrie: KeywordTrie = self.findKeywordTrie(languageName)
+
+        # Spelling of each keyword type, the first one listed when a type has several
+        keywordNames: dict[TokenType, str] = {}
+
+        for keyword, type in self.keywords.items():
+            keywordNames.setdefault(type, keyword)
+
+        self.keywordNames: Mapping[TokenType, str] = MappingProxyType(keywordNames)
+        self.thisName: str = keywordNames[TokenType.THIS]
+        self.superName: str = keywordNames[TokenType.SUPER]
+        self.initName: str = 'init'
         self.errors: dict[ErrorType, str] = errors[languageName]
         self.stdLibNames: dict[StdLibTypes, str] = stdLibNames[languageName]
         # self.messages = messages[languageName]
+
+    def findKeywordTrie(self, languageName: str) -> KeywordTrie:
+        if languageName not in keywordTries:
+            keywordTries[languageName] = KeywordTrie.build(self.keywords)
+
+        return keywordTries[languageName]
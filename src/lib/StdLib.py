@@ -1,48 +1,43 @@
-from Callable import Callable
+from NativeFunction import NativeFunction
 from Environment import Environment
-from RuntimeError import RuntimeError
-from Expr import Call
 from language.Language import Language
 from lib.StdLibTypes import StdLibTypes
-from typing import List, Any, override
+from typing import Any, List, override
 from time import time
 
 def defineStdLib(globals: Environment, language: Language):
-    global languageName
-    languageName = language.languageName
+    names: dict[StdLibTypes, str] = language.stdLibNames
 
-    stdLib: dict[str, Callable] = {
-        language.stdLibNames[StdLibTypes.CLOCK]: Clock(),
-        language.stdLibNames[StdLibTypes.WRITE]: Write(),
-        language.stdLibNames[StdLibTypes.READ]: Read(),
-        language.stdLibNames[StdLibTypes.STRING]: String()
-    }
+    stdLib: List[NativeFunction] = [
+        Clock(names[StdLibTypes.CLOCK]),
+        Write(names[StdLibTypes.WRITE], language.languageName),
+        Read(names[StdLibTypes.READ]),
+        String(names[StdLibTypes.STRING]),
+    ]
 
-    for name, function in stdLib.items():
-        globals.define(name, function)
+    for function in stdLib:
+        globals.define(function.name, function)
 
-class Clock(Callable):
-    def __init__(self) -> None:
+class Clock(NativeFunction):
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
         self.startTime = time()
 
     @override
-    def call(self, interpreter, arguments: List[Any]) -> Any:
+    def function(self) -> float:
         return time() - self.startTime
 
-    @override
-    def arity(self) -> int:
-        return 0
+class Write(NativeFunction):
+    minArity = 1
+    maxArity = 1
 
-    @override
-    def __str__(self) -> str:
-        return '<native function "clock">'
+    def __init__(self, name: str, languageName: str) -> None:
+        super().__init__(name)
+        self.languageName: str = languageName
 
-class Write(Callable):
     @override
-    def call(self, interpreter, arguments: List[Any]) -> Any:
-        value = arguments[0]
-
-        match languageName:
+    def function(self, value: Any) -> None:
+        match self.languageName:
             case 'English':
                 if value is None: value = 'none'
                 if value is True: value = 'true'
@@ -55,51 +50,19 @@ class Write(Callable):
 
         return print(str(value))
 
-    @override
-    def arity(self) -> int:
-        return 1
-
-    def __str__(self) -> str:
-        return '<native function "write">'
-
-class Read(Callable):
-    def __init__(self) -> None:
-        self.argument = False
+class Read(NativeFunction):
+    # The prompt is optional
+    minArity = 0
+    maxArity = 1
 
     @override
-    def call(self, interpreter, arguments: List[Any]) -> Any:
-        if arguments:
-            return input(arguments[0])
+    def function(self, prompt: Any = '') -> str:
+        return input(prompt)
 
-        return input()
-
-    @override
-    def arity(self) -> int:
-        if self.argument:
-            return 1
+class String(NativeFunction):
+    minArity = 1
+    maxArity = 1
 
-        return 0
-
-    def checkArity(self, arguments: List[Any], expr: Call) -> None:
-        if len(arguments) == 1:
-            self.argument = True
-
-        elif not len(arguments) == 0:
-            raise RuntimeError(expr.paren, f'Native function "read" can only take 1 or no arguments but {len(arguments)} were given')
-
-    @override
-    def __str__(self) -> str:
-        return '<native function "read">'
-
-class String(Callable):
-    @override
-    def call(self, interpreter, arguments: List[Any]) -> Any:
-        return str(arguments[0])
-    
-    @override
-    def arity(self) -> int:
-        return 1
-    
     @override
-    def __str__(self) -> str:
-        return '<native function "string">'
+    def function(self, value: Any) -> str:
+        return str(value)
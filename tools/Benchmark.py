@@ -0,0 +1,59 @@
+from sys import argv, exit, path
+from os.path import basename, dirname, join
+from glob import glob
+from contextlib import redirect_stdout
+from io import StringIO
+from time import perf_counter
+from typing import List
+
+path.insert(0, join(dirname(__file__), '..', 'src'))
+
+from Wiz import Wiz, backends
+
+def main():
+    options: List[str] = [argument for argument in argv[1:] if argument.startswith('--')]
+    files: List[str] = [argument for argument in argv[1:] if not argument.startswith('--')]
+    names: List[str] = list(backends)
+    repeat: int = 5
+
+    for option in options:
+        name, _, value = option[2:].partition('=')
+
+        match name:
+            case 'backend': names = value.split(',')
+            case 'repeat': repeat = int(value)
+            case _:
+                print('Usage: py benchmark.py [--backend=vm,closure,python,tree] [--repeat=5] [scripts].wiz')
+                exit(64)
+
+    if not files:
+        files = sorted(glob(join(dirname(__file__), '..', 'benchmarks', '*.wiz')))
+
+    print(f'{"script":<16}' + ''.join(f'{name:>10}' for name in names))
+
+    for file in files:
+        source: str = open(file, 'r', encoding='UTF-8').read()
+        times: List[str] = [f'{measure(source, name, repeat) * 1000:>8.0f}ms' for name in names]
+        print(f'{basename(file):<16}' + ''.join(times))
+
+def measure(source: str, backend: str, repeat: int) -> float:
+    # Best of several runs, each on a fresh interpreter, without the AST cache
+    best: float = float('inf')
+
+    for _ in range(repeat):
+        wiz: Wiz = Wiz()
+        wiz.backend = backend
+        wiz.cache = None
+        wiz.findLanguage(source)
+
+        start: float = perf_counter()
+
+        with redirect_stdout(StringIO()):
+            wiz.run(source, False)
+
+        best = min(best, perf_counter() - start)
+
+    return best
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+from sys import argv, exit, path
+from os.path import dirname, join
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import List
+
+path.insert(0, join(dirname(__file__), '..', 'src'))
+
+from Scanner import Scanner
+from RegexScanner import RegexScanner
+from ErrorHandler import ErrorHandler
+from language.Language import Language
+
+def main():
+    if len(argv) < 3:
+        print('Usage: py comparescanners.py [language] [files]')
+        exit(64)
+
+    language: Language = Language(argv[1])
+    failed: bool = False
+
+    for file in argv[2:]:
+        source: str = open(file, 'r', encoding='UTF-8').read()
+
+        reference = scan(Scanner, source, language)
+        regex = scan(RegexScanner, source, language)
+
+        if reference != regex:
+            print(f'{file}: scanners disagree')
+            failed = True
+
+    exit(1 if failed else 0)
+
+def scan(scanner: type, source: str, language: Language) -> tuple[List[tuple], str, bool]:
+    errorHandler: ErrorHandler = ErrorHandler(language.errors)
+    output: StringIO = StringIO()
+
+    with redirect_stdout(output):
+        tokens = scanner(source, language.keywordTrie, errorHandler).scanTokens()
+
+    return [(token.type, token.lexeme, token.literal, token.line, token.column) for token in tokens], output.getvalue(), errorHandler.hadError
+
+if __name__ == '__main__':
+    main()
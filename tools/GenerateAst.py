@@ -12,17 +12,17 @@ def main():
         outputDir, 
         'Expr',
         [
-            'Assign | name: Token, value: Expr',
-            'Binary | left: Expr, operator: Token, right: Expr',
-            'Call | callee: Expr, paren: Token, arguments: List[Expr]',
-            'Get | object: Expr, name: Token',
-            'Set | object: Expr, name: Token, value: Expr',
-            'Super | keyword: Token, method: Token',
-            'This | keyword: Token',
+            'Assign | name: Token, value: Expr | depth: int, slot: int',
+            'Binary | left: Expr, operator: Token, right: Expr | operands: type, guardLeft: bool, guardRight: bool',
+            'Call | callee: Expr, paren: Token, arguments: List[Expr] | tail: bool',
+            'Get | object: Expr, name: Token | shape: Any, index: int',
+            'Set | object: Expr, name: Token, value: Expr | shape: Any, index: int, transition: Any',
+            'Super | keyword: Token, method: Token | depth: int, slot: int',
+            'This | keyword: Token | depth: int, slot: int',
             'Grouping | expression: Expr',
             'Literal | value: Any',
             'Unary | operator: Token, right: Expr',
-            'Variable | name: Token',
+            'Variable | name: Token | depth: int, slot: int',
         ]
     )
     
@@ -32,11 +32,12 @@ def main():
         [
             'If | condition: Expr, thenBranch: Stmt, elseBranch: Stmt',
             'While | condition: Expr, body: Stmt',
-            'Var | name: Token, initializer: Expr',
-            'Function | name: Token, params: List[Token], body: List[Stmt]',
+            'For | keyword: Token, name: Token, start: Expr, end: Expr, body: "Block" | perIteration: bool',
+            'Var | name: Token, initializer: Expr | slot: int',
+            'Function | name: Token, params: List[Token], body: List[Stmt] | slot: int, size: int',
             'Return | keyword: Token, value: Expr',
-            'Block | statements: List[Stmt]',
-            'Class | name: Token, superclass: Variable, methods: List["Function"]',
+            'Block | statements: List[Stmt] | size: int',
+            'Class | name: Token, superclass: Variable, methods: List["Function"] | slot: int',
             'Expression | expression: Expr',
         ]
     )
@@ -54,6 +55,7 @@ def defineAst(outpurDir:str, baseName:str, types:List[str]):
 
     # Base class
     outputFile.write(f'\nclass {baseName}(ABC):\n')
+    outputFile.write(f'    __slots__ = ()\n\n')
     outputFile.write(f'    class Visitor(ABC):\n')
 
     for type in types:
@@ -70,19 +72,29 @@ def defineAst(outpurDir:str, baseName:str, types:List[str]):
     for type in types:
         className = type.split('|')[0].strip()
         fields = type.split('|')[1].strip()
-        defineType(outputFile, baseName, className, fields)
+        resolvedFields = type.split('|')[2].strip() if type.count('|') > 1 else ''
+        defineType(outputFile, baseName, className, fields, resolvedFields)
+
+def defineType(outputFile:str, baseName:str, className:str, fieldList:str, resolvedFieldList:str):
+    fields:List[str] = fieldList.split(', ')
+    resolvedFields:List[str] = resolvedFieldList.split(', ') if resolvedFieldList else []
+    names:List[str] = [field.split(':')[0].strip() for field in fields + resolvedFields]
 
-def defineType(outputFile:str, baseName:str, className:str, fieldList:str):
     outputFile.write(f'\nclass {className}({baseName}):\n')
+    slots:str = ', '.join(repr(name) for name in names) + (',' if len(names) == 1 else '')
+    outputFile.write(f'    __slots__ = ({slots})\n\n')
     outputFile.write(f'    def __init__(self, {fieldList}):\n')
 
     # Store parameters in fields
-    fields:List[str] = fieldList.split(', ')
     for field in fields:
         nameAnnotation = field.strip()
         name = nameAnnotation.split(':')[0].strip()
         outputFile.write(f'        self.{nameAnnotation} = {name}\n')
 
+    # Fields filled in after parsing, by the resolver or by the property caches at runtime
+    for field in resolvedFields:
+        outputFile.write(f'        self.{field.strip()} = None\n')
+
     # Visitor pattern
     outputFile.write(f'\n    @override')
     outputFile.write(f'\n    def accept(self, visitor: {baseName}.Visitor):\n')
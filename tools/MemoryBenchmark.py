@@ -0,0 +1,54 @@
+from sys import argv, exit, path
+from os.path import dirname, join
+from re import search
+from tracemalloc import start, stop, get_traced_memory
+from typing import Any, List
+
+path.insert(0, join(dirname(__file__), '..', 'src'))
+
+from RegexScanner import RegexScanner
+from Parser import Parser
+from ErrorHandler import ErrorHandler
+from Expr import Expr
+from Stmt import Stmt
+from Token import Token
+from language.Language import Language
+
+def main():
+    if len(argv) != 2:
+        print('Usage: py memorybenchmark.py [script].wiz')
+        exit(64)
+
+    source: str = open(argv[1], 'r', encoding='UTF-8').read()
+    language: Language = Language(search(r'^\s*@\s*(\w+)', source).group(1))
+    errorHandler: ErrorHandler = ErrorHandler(language.errors)
+
+    start()
+
+    tokens: List[Token] = RegexScanner(source, language.keywordTrie, errorHandler).scanTokens()
+    tokenBytes: int = get_traced_memory()[0]
+
+    statements: List[Stmt] = Parser(tokens, errorHandler).parse()
+    nodeBytes: int = get_traced_memory()[0] - tokenBytes
+
+    stop()
+
+    if errorHandler.hadError: exit(65)
+
+    nodes: int = countNodes(statements)
+
+    print(f'{len(tokens)} tokens, {tokenBytes / len(tokens):.1f} bytes per token')
+    print(f'{nodes} nodes, {nodeBytes / nodes:.1f} bytes per node')
+
+def countNodes(value: Any) -> int:
+    if isinstance(value, list):
+        return sum(countNodes(item) for item in value)
+
+    if not isinstance(value, Expr | Stmt):
+        return 0
+
+    fields = value.__dict__.values() if hasattr(value, '__dict__') else [getattr(value, name) for name in value.__slots__]
+    return 1 + sum(countNodes(field) for field in fields)
+
+if __name__ == '__main__':
+    main()